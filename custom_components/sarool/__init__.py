@@ -1,14 +1,44 @@
 """Intégration Sarool pour Home Assistant."""
 import logging
+import os
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.aiohttp_client import (
+    async_create_clientsession,
+    async_get_clientsession,
+)
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.typing import ConfigType
 
 from .api import SaroolApiClient
-from .const import CONF_PK, CONF_UK, DOMAIN
+from .archive import SaroolLessonArchive
+from .cassette import SaroolCassetteRecorder
+from .const import (
+    ARCHIVE_DIR,
+    CASSETTE_DIR,
+    CONF_ARCHIVE_HORIZON,
+    CONF_ENABLE_CALENDAR,
+    CONF_PK,
+    CONF_RECORD_CASSETTES,
+    CONF_TRACE_EXPORT,
+    CONF_UK,
+    DEFAULT_ARCHIVE_HORIZON,
+    DEFAULT_ENABLE_CALENDAR,
+    DEFAULT_RECORD_CASSETTES,
+    DEFAULT_TRACE_EXPORT,
+    DOMAIN,
+    LIVE_OPTIONS,
+    OPTION_DEFAULTS,
+    SIGNAL_ENTRY_UNLOADED,
+    TRACE_DIR,
+)
 from .coordinator import SaroolDataCoordinator
+from .services import async_setup_services
+from .tracing import SaroolTracer
+from .websocket_api import async_setup_websocket
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,6 +48,24 @@ PLATFORMS: list[Platform] = [
     Platform.CALENDAR,    # Le calendrier du planning
 ]
 
+# L'intégration se configure uniquement via l'interface
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Configure les éléments communs à toutes les entrées (services, websocket).
+    
+    Args:
+        hass: Instance Home Assistant
+        config: Configuration YAML (non utilisée)
+        
+    Returns:
+        True
+    """
+    async_setup_services(hass)
+    async_setup_websocket(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Configure l'intégration Sarool à partir d'une entrée de configuration.
@@ -38,22 +86,54 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     uk = entry.data[CONF_UK]
 
     # Créer le client API
-    session = async_get_clientsession(hass)
-    api_client = SaroolApiClient(session)
+    tracer = SaroolTracer(
+        entry.options.get(CONF_TRACE_EXPORT, DEFAULT_TRACE_EXPORT),
+        hass.config.path(TRACE_DIR, f"{entry.entry_id}.jsonl"),
+        hass.async_add_executor_job,
+    )
+    if tracer.enabled:
+        # Session dédiée pour tracer la résolution DNS et les connexions (TLS)
+        session = async_create_clientsession(
+            hass, trace_configs=[tracer.aiohttp_trace_config()]
+        )
+    else:
+        session = async_get_clientsession(hass)
+    api_client = SaroolApiClient(
+        session, executor=hass.async_add_executor_job, tracer=tracer
+    )
     api_client.set_credentials(pk, uk)
+    if entry.options.get(CONF_RECORD_CASSETTES, DEFAULT_RECORD_CASSETTES):
+        api_client.recorder = SaroolCassetteRecorder(
+            hass.config.path(CASSETTE_DIR, entry.entry_id),
+            hass.async_add_executor_job,
+        )
+
+    # Ouvrir l'archive des leçons anciennes (horizon à 0 : tout en mémoire)
+    archive = None
+    if entry.options.get(CONF_ARCHIVE_HORIZON, DEFAULT_ARCHIVE_HORIZON):
+        archive = SaroolLessonArchive(_archive_path(hass, entry))
+        await hass.async_add_executor_job(archive.open)
 
     # Créer le coordinateur de données
-    coordinator = SaroolDataCoordinator(hass, api_client)
+    coordinator = SaroolDataCoordinator(hass, api_client, entry, archive)
 
     # Faire une première récupération des données
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        if archive is not None:
+            await hass.async_add_executor_job(archive.close)
+        raise
 
     # Stocker le coordinateur dans hass.data pour que les plateformes puissent y accéder
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
-    # Configurer les plateformes (sensors, calendar)
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # Configurer les plateformes (sensors, calendar si activé)
+    await hass.config_entries.async_forward_entry_setups(entry, _platforms(entry.options))
+
+    # Appliquer les options modifiées (rechargement si les entités changent)
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     _LOGGER.info("Intégration Sarool configurée avec succès")
     return True
@@ -73,11 +153,75 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """
     _LOGGER.info("Déchargement de l'intégration Sarool")
 
-    # Décharger les plateformes
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    # Décharger les plateformes chargées avec les options appliquées
+    coordinator: SaroolDataCoordinator = hass.data[DOMAIN][entry.entry_id]
+    unload_ok = await hass.config_entries.async_unload_platforms(
+        entry, _platforms(coordinator.options)
+    )
 
     # Supprimer les données stockées
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        # Terminer les abonnements websocket (déchargement ou rechargement)
+        async_dispatcher_send(hass, SIGNAL_ENTRY_UNLOADED.format(entry.entry_id))
+        await coordinator.async_shutdown()
+        if coordinator.archive is not None:
+            await hass.async_add_executor_job(coordinator.archive.close)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Supprime l'archive des leçons lors de la suppression de l'intégration.
+    
+    Args:
+        hass: Instance Home Assistant
+        entry: Entrée de configuration supprimée
+    """
+    path = _archive_path(hass, entry)
+    if await hass.async_add_executor_job(os.path.exists, path):
+        await hass.async_add_executor_job(os.remove, path)
+
+
+def _archive_path(hass: HomeAssistant, entry: ConfigEntry) -> str:
+    """Retourne le chemin de l'archive SQLite d'une entrée."""
+    return hass.config.path(ARCHIVE_DIR, f"{entry.entry_id}.db")
+
+
+def _platforms(options) -> list[Platform]:
+    """Retourne les plateformes à charger selon les options."""
+    if options.get(CONF_ENABLE_CALENDAR, DEFAULT_ENABLE_CALENDAR):
+        return PLATFORMS
+    return [platform for platform in PLATFORMS if platform != Platform.CALENDAR]
+
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Applique les options modifiées.
+    
+    L'intervalle et les sections récupérées sont appliqués directement par
+    le coordinateur, et le calendrier est ajouté ou retiré en chargeant ou
+    déchargeant sa seule plateforme. Les autres options (capteurs de
+    progression, traces, archive...) rechargent l'intégration.
+    
+    Args:
+        hass: Instance Home Assistant
+        entry: Entrée de configuration
+    """
+    coordinator: SaroolDataCoordinator = hass.data[DOMAIN][entry.entry_id]
+    previous, options = coordinator.options, entry.options
+    changed = set()
+    for key in previous.keys() | options.keys():
+        default = OPTION_DEFAULTS.get(key)
+        if previous.get(key, default) != options.get(key, default):
+            changed.add(key)
+    if changed - LIVE_OPTIONS:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    if CONF_ENABLE_CALENDAR in changed:
+        if options.get(CONF_ENABLE_CALENDAR, DEFAULT_ENABLE_CALENDAR):
+            await hass.config_entries.async_forward_entry_setups(entry, [Platform.CALENDAR])
+        else:
+            await hass.config_entries.async_unload_platforms(entry, [Platform.CALENDAR])
+    if changed:
+        # Met aussi à jour coordinator.options, qui donne les plateformes chargées
+        await coordinator.async_apply_options(options)
@@ -0,0 +1,182 @@
+"""Statistiques de progression de l'élève, maintenues de façon incrémentale."""
+from __future__ import annotations
+
+from datetime import datetime
+import heapq
+import re
+from typing import Any
+
+from .lessons import LessonDelta, SaroolLesson
+
+# Catégorie de chaque leçon connue du suivi
+_CANCELLED = "cancelled"
+_DONE = "done"  # Leçon confirmée passée (compte dans les heures de conduite)
+_PAST = "past"  # Créneau prévisionnel passé (ne compte pas)
+_UPCOMING = "upcoming"
+
+# Volume d'heures d'une formule F1, par exemple « Permis B - 20h » ou « AAC 20 h »
+_FORMULA_HOURS = re.compile(r"(\d+(?:[.,]\d+)?)\s*h(?:eures?)?\b", re.IGNORECASE)
+
+
+class SaroolProgressTracker:
+    """Compteurs de progression mis à jour à partir des différences de leçons.
+
+    Chaque rafraîchissement n'applique que les leçons ajoutées, modifiées ou
+    supprimées, puis fait passer dans le passé les leçons dont l'heure est
+    atteinte (tas trié par date de début). Les capteurs lisent donc des
+    compteurs en O(1) au lieu de reparcourir tout l'historique.
+    """
+
+    def __init__(self) -> None:
+        """Initialise un suivi vide."""
+        self._lessons: dict[str, SaroolLesson] = {}
+        self._category: dict[str, str] = {}
+        # Leçons à venir (début, clé), invalidées paresseusement
+        self._pending: list[tuple[datetime, str]] = []
+
+        self.total_count = 0
+        self.cancelled_count = 0
+        self.done_count = 0
+        self.done_minutes = 0
+        self.upcoming_count = 0
+        self.first_done: datetime | None = None
+
+    def apply(self, delta: LessonDelta, now: datetime) -> None:
+        """Applique les différences d'un rafraîchissement.
+
+        Args:
+            delta: Leçons ajoutées, modifiées, supprimées et archivées
+            now: Heure courante
+        """
+        for lesson in delta.removed:
+            self._remove(lesson.key)
+        for old, new in delta.changed:
+            self._remove(old.key)
+            self._add(new, now)
+        for lesson in delta.added:
+            self._add(lesson, now)
+        # Avant l'oubli : une leçon encore à venir au rafraîchissement
+        # précédent peut être archivée sans avoir été comptée comme passée
+        self.advance(now)
+        for lesson in delta.evicted:
+            self._forget(lesson.key)
+
+    def advance(self, now: datetime) -> None:
+        """Fait passer dans le passé les leçons dont le début est atteint."""
+        while self._pending and self._pending[0][0] <= now:
+            start, key = heapq.heappop(self._pending)
+            lesson = self._lessons.get(key)
+            # Entrée obsolète (leçon supprimée, modifiée ou déjà traitée)
+            if (
+                lesson is None
+                or self._category.get(key) != _UPCOMING
+                or lesson.start != start
+            ):
+                continue
+            self.upcoming_count -= 1
+            self._mark_past(lesson)
+
+    def _add(self, lesson: SaroolLesson, now: datetime) -> None:
+        """Comptabilise une nouvelle leçon."""
+        if lesson.key in self._lessons:
+            # Clé en double dans la réponse de l'API : ne compter qu'une fois
+            self._remove(lesson.key)
+
+        self._lessons[lesson.key] = lesson
+        self.total_count += 1
+
+        if lesson.annule:
+            self.cancelled_count += 1
+            self._category[lesson.key] = _CANCELLED
+        elif lesson.start <= now:
+            self._mark_past(lesson)
+        else:
+            self.upcoming_count += 1
+            self._category[lesson.key] = _UPCOMING
+            heapq.heappush(self._pending, (lesson.start, lesson.key))
+
+    def _mark_past(self, lesson: SaroolLesson) -> None:
+        """Classe une leçon passée (effectuée ou créneau prévisionnel)."""
+        if lesson.previsionnel:
+            self._category[lesson.key] = _PAST
+            return
+
+        self._category[lesson.key] = _DONE
+        self.done_count += 1
+        self.done_minutes += lesson.duree
+        if self.first_done is None or lesson.start < self.first_done:
+            self.first_done = lesson.start
+
+    def _remove(self, key: str) -> None:
+        """Retire la contribution d'une leçon connue."""
+        lesson = self._lessons.pop(key, None)
+        if lesson is None:
+            return
+        category = self._category.pop(key)
+        self.total_count -= 1
+
+        if category == _CANCELLED:
+            self.cancelled_count -= 1
+        elif category == _UPCOMING:
+            # L'entrée du tas sera ignorée lors de son dépilement
+            self.upcoming_count -= 1
+        elif category == _DONE:
+            self.done_count -= 1
+            self.done_minutes -= lesson.duree
+            if lesson.start == self.first_done:
+                # Cas rare : recalculer la première leçon effectuée
+                self.first_done = min(
+                    (
+                        l.start
+                        for k, l in self._lessons.items()
+                        if self._category[k] == _DONE
+                    ),
+                    default=None,
+                )
+
+    def _forget(self, key: str) -> None:
+        """Oublie une leçon archivée en conservant sa contribution aux compteurs.
+
+        Les leçons archivées sont passées : elles ne seront plus ni
+        modifiées ni supprimées par les rafraîchissements suivants.
+        """
+        self._lessons.pop(key, None)
+        self._category.pop(key, None)
+
+    @property
+    def driving_hours(self) -> float:
+        """Heures de conduite effectuées."""
+        return round(self.done_minutes / 60, 2)
+
+    @property
+    def cancellation_rate(self) -> float | None:
+        """Pourcentage de leçons annulées."""
+        if not self.total_count:
+            return None
+        return round(self.cancelled_count / self.total_count * 100, 1)
+
+    def lessons_per_week(self, now: datetime) -> float | None:
+        """Nombre moyen de leçons effectuées par semaine depuis la première."""
+        if self.first_done is None:
+            return None
+        weeks = max((now - self.first_done).days / 7, 1)
+        return round(self.done_count / weeks, 2)
+
+    def hours_remaining(self, info: dict[str, Any]) -> float | None:
+        """Heures de la formule restant à effectuer.
+
+        Args:
+            info: Informations F1 de l'élève (Formule)
+        """
+        hours = formula_hours(info.get("Formule"))
+        if hours is None:
+            return None
+        return round(max(hours - self.done_minutes / 60, 0), 2)
+
+
+def formula_hours(formule: str | None) -> float | None:
+    """Retourne le volume d'heures d'une formule, s'il figure dans son libellé."""
+    match = _FORMULA_HOURS.search(formule or "")
+    if match is None:
+        return None
+    return float(match.group(1).replace(",", "."))
@@ -1,19 +1,38 @@
 """Client API pour Sarool."""
 import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+import hashlib
 import logging
-from datetime import datetime
+import time
 from typing import Any
 
 import aiohttp
 from aiohttp import ClientError, ClientSession
 
 from .const import (
+    API_BASE_URL,
     API_F1,
     API_F2,
     API_F3,
     API_PERIPHERIQUE,
     API_UTILISATEUR,
+    DATA_SECTIONS,
+    JSON_OFFLOAD_THRESHOLD,
+    SECTION_INFO,
+    SECTION_LESSONS,
+    SECTION_RECAP,
+    SECTION_USER_DATA,
 )
+from .cassette import SaroolCassetteRecorder
+from .profiler import profiled
+from .tracing import SaroolTracer
+
+try:
+    # Décodeur rapide de Home Assistant (basé sur orjson), qui travaille
+    # directement sur les octets sans passer par une chaîne Python.
+    from homeassistant.util.json import json_loads
+except ImportError:  # Versions de Home Assistant sans json_loads
+    from json import loads as json_loads
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,13 +44,33 @@ class SaroolApiError(Exception):
 class SaroolApiClient:
     """Client pour l'API Sarool."""
 
-    def __init__(self, session: ClientSession) -> None:
+    def __init__(
+        self,
+        session: ClientSession,
+        base_url: str = API_BASE_URL,
+        executor: Callable[..., Awaitable[Any]] | None = None,
+        tracer: SaroolTracer | None = None,
+    ) -> None:
         """Initialise le client API.
         
         Args:
             session: Session aiohttp pour les requêtes HTTP
+            base_url: URL de base de l'API (surchargée par le banc de charge local)
+            executor: Fonction d'exécution hors boucle (``hass.async_add_executor_job``)
+                utilisée pour décoder les gros payloads
+            tracer: Traceur des appels API (désactivé par défaut)
         """
         self._session = session
+        self._base_url = base_url.rstrip("/")
+        self._executor = executor
+        self.tracer = tracer or SaroolTracer()
+        # Enregistreur de cassettes (mode enregistrement, désactivé par défaut)
+        self.recorder: SaroolCassetteRecorder | None = None
+        self.blocking_time = 0.0  # Temps de décodage passé dans la boucle (s)
+        self.offloaded_decodes = 0  # Nombre de décodages déportés dans l'exécuteur
+        self.reused_decodes = 0  # Réponses identiques à la précédente (non décodées)
+        # Dernière réponse décodée par endpoint, avec l'empreinte de son corps
+        self._decoded: dict[str, tuple[bytes, Any]] = {}
         self._pk: str | None = None  # Clé périphérique
         self._uk: str | None = None  # Clé utilisateur
 
@@ -60,12 +99,12 @@ class SaroolApiClient:
 
         try:
             async with self._session.post(
-                API_PERIPHERIQUE,
+                f"{self._base_url}{API_PERIPHERIQUE}",
                 json=payload,
                 headers={"Content-Type": "application/json"},
             ) as response:
                 if response.status == 201:
-                    data = await response.json()
+                    data = await self._async_decode(await response.read())
                     self._pk = data.get("PK")
                     self._uk = data.get("UK")
                     _LOGGER.info("Authentification Sarool réussie")
@@ -104,24 +143,123 @@ class SaroolApiClient:
             "Content-Type": "application/json",
         }
 
+    async def _async_get(
+        self, path: str, params: dict[str, str] | None = None
+    ) -> dict[str, Any]:
+        """Effectue une requête GET authentifiée et décode la réponse JSON.
+        
+        Le corps est lu en octets puis décodé par ``_async_decode``, qui
+        déporte les gros payloads dans l'exécuteur.
+        
+        Args:
+            path: Chemin de l'endpoint (relatif à l'URL de base)
+            params: Paramètres de la requête
+            
+        Returns:
+            Réponse JSON décodée
+            
+        Raises:
+            SaroolApiError: En cas d'erreur HTTP ou de connexion
+        """
+        with self.tracer.span("api.request", endpoint=path) as span:
+            try:
+                start = time.perf_counter()
+                async with self._session.get(
+                    f"{self._base_url}{path}",
+                    headers=self._get_headers(),
+                    params=params,
+                ) as response:
+                    if span is not None:
+                        span.set(status=response.status)
+                    if self.recorder is not None:
+                        self.recorder.record(
+                            "GET",
+                            path,
+                            params,
+                            response.status,
+                            time.perf_counter() - start,
+                            await response.read(),
+                        )
+                    if response.status == 200:
+                        body = await response.read()
+                    elif response.status == 401:
+                        raise SaroolApiError("Échec d'authentification")
+                    else:
+                        raise SaroolApiError(f"Erreur API: {response.status}")
+            except ClientError as err:
+                raise SaroolApiError(f"Erreur de connexion: {err}") from err
+
+            # Corps identique au précédent : réutiliser l'objet déjà décodé.
+            # Le coordinateur détecte ainsi les sections inchangées par simple
+            # comparaison d'identité (les données ne sont jamais modifiées).
+            fingerprint = hashlib.blake2b(body, digest_size=16).digest()
+            cache_key = f"{path}?{sorted((params or {}).items())}"
+            cached = self._decoded.get(cache_key)
+            if cached is not None and cached[0] == fingerprint:
+                self.reused_decodes += 1
+                if span is not None:
+                    span.set(unchanged=True)
+                return cached[1]
+
+            decoded = await self._async_decode(body)
+            self._decoded[cache_key] = (fingerprint, decoded)
+            return decoded
+
+    async def _async_decode(self, body: bytes) -> Any:
+        """Décode un corps JSON, dans l'exécuteur s'il est volumineux.
+        
+        Les petits payloads restent décodés dans la boucle d'événements (le
+        passage par l'exécuteur coûterait plus cher que le décodage lui-même).
+        Le temps passé à bloquer la boucle est cumulé dans ``blocking_time``.
+        
+        Args:
+            body: Corps brut de la réponse
+            
+        Returns:
+            Données JSON décodées
+        """
+        offload = self._executor is not None and len(body) >= JSON_OFFLOAD_THRESHOLD
+        with self.tracer.span("json.decode", bytes=len(body), offloaded=offload):
+            try:
+                if offload:
+                    self.offloaded_decodes += 1
+                    return await self._executor(profiled(json_loads), body)
+
+                start = time.perf_counter()
+                try:
+                    return json_loads(body)
+                finally:
+                    self.blocking_time += time.perf_counter() - start
+            except ValueError as err:
+                raise SaroolApiError(f"Réponse JSON invalide: {err}") from err
+
+    def replace_decoded(self, old: Any, new: Any) -> None:
+        """Remplace une réponse décodée conservée pour la réutilisation.
+
+        Utilisé quand le coordinateur élague une section (leçons archivées) :
+        une réponse identique renverra alors la version élaguée, et la
+        comparaison d'identité des sections continue de fonctionner.
+
+        Args:
+            old: Objet décodé retourné précédemment
+            new: Objet qui le remplace
+        """
+        for cache_key, (fingerprint, decoded) in self._decoded.items():
+            if decoded is old:
+                self._decoded[cache_key] = (fingerprint, new)
+
+    def pop_blocking_time(self) -> float:
+        """Retourne et remet à zéro le temps de blocage cumulé (secondes)."""
+        blocking_time, self.blocking_time = self.blocking_time, 0.0
+        return blocking_time
+
     async def get_student_info(self) -> dict[str, Any]:
         """Récupère les informations de l'élève (F1).
         
         Returns:
             Dictionnaire avec les infos de l'élève
         """
-        try:
-            async with self._session.get(
-                API_F1, headers=self._get_headers()
-            ) as response:
-                if response.status == 200:
-                    return await response.json()
-                elif response.status == 401:
-                    raise SaroolApiError("Échec d'authentification")
-                else:
-                    raise SaroolApiError(f"Erreur API: {response.status}")
-        except ClientError as err:
-            raise SaroolApiError(f"Erreur de connexion: {err}") from err
+        return await self._async_get(API_F1)
 
     async def get_student_recap(self) -> dict[str, Any]:
         """Récupère le récapitulatif financier de l'élève (F2).
@@ -129,18 +267,7 @@ class SaroolApiClient:
         Returns:
             Dictionnaire avec solde, leçons, prestations, etc.
         """
-        try:
-            async with self._session.get(
-                API_F2, headers=self._get_headers()
-            ) as response:
-                if response.status == 200:
-                    return await response.json()
-                elif response.status == 401:
-                    raise SaroolApiError("Échec d'authentification")
-                else:
-                    raise SaroolApiError(f"Erreur API: {response.status}")
-        except ClientError as err:
-            raise SaroolApiError(f"Erreur de connexion: {err}") from err
+        return await self._async_get(API_F2)
 
     async def get_student_lessons(self) -> dict[str, Any]:
         """Récupère la liste complète des leçons de l'élève (F2/Lecons).
@@ -151,18 +278,7 @@ class SaroolApiClient:
         Returns:
             Dictionnaire avec la liste des leçons
         """
-        try:
-            async with self._session.get(
-                f"{API_F2}/Lecons", headers=self._get_headers()
-            ) as response:
-                if response.status == 200:
-                    return await response.json()
-                elif response.status == 401:
-                    raise SaroolApiError("Échec d'authentification")
-                else:
-                    raise SaroolApiError(f"Erreur API: {response.status}")
-        except ClientError as err:
-            raise SaroolApiError(f"Erreur de connexion: {err}") from err
+        return await self._async_get(f"{API_F2}/Lecons")
 
     async def get_user_data(
         self,
@@ -182,56 +298,77 @@ class SaroolApiClient:
         Returns:
             Dictionnaire avec les données de l'utilisateur
         """
-        try:
-            params = {
-                "avecPersistant": str(with_persistent).lower(),
-                "avecInfoEleve": str(with_info).lower(),
-                "avecRecapEleve": str(with_recap).lower(),
-                "avecFichierEleve": str(with_files).lower(),
-            }
-            async with self._session.get(
-                f"{API_UTILISATEUR}/Donnees",
-                headers=self._get_headers(),
-                params=params,
-            ) as response:
-                if response.status == 200:
-                    return await response.json()
-                elif response.status == 401:
-                    raise SaroolApiError("Échec d'authentification")
-                else:
-                    raise SaroolApiError(f"Erreur API: {response.status}")
-        except ClientError as err:
-            raise SaroolApiError(f"Erreur de connexion: {err}") from err
+        params = {
+            "avecPersistant": str(with_persistent).lower(),
+            "avecInfoEleve": str(with_info).lower(),
+            "avecRecapEleve": str(with_recap).lower(),
+            "avecFichierEleve": str(with_files).lower(),
+        }
+        return await self._async_get(f"{API_UTILISATEUR}/Donnees", params)
+
+    async def get_sections(
+        self, sections: Iterable[str]
+    ) -> dict[str, dict[str, Any] | SaroolApiError]:
+        """Récupère plusieurs sections de données en parallèle.
+        
+        Contrairement à ``get_all_data``, l'échec d'un endpoint n'annule
+        pas les autres : chaque section reçoit soit ses données, soit
+        l'erreur rencontrée.
+        
+        Args:
+            sections: Sections à récupérer (info, recap, lessons, user_data)
+            
+        Returns:
+            Dictionnaire section -> données ou SaroolApiError
+        """
+        fetchers = {
+            SECTION_INFO: self.get_student_info,
+            SECTION_RECAP: self.get_student_recap,
+            SECTION_LESSONS: self.get_student_lessons,  # F2/Lecons plutôt que F3
+            SECTION_USER_DATA: self.get_user_data,
+        }
+        sections = list(sections)
+        with self.tracer.span("api.gather", sections=sections):
+            results = await asyncio.gather(
+                *(fetchers[section]() for section in sections),
+                return_exceptions=True,
+            )
+
+        merged: dict[str, dict[str, Any] | SaroolApiError] = {}
+        for section, result in zip(sections, results):
+            if isinstance(result, SaroolApiError):
+                merged[section] = result
+            elif isinstance(result, Exception):
+                merged[section] = SaroolApiError(f"Erreur inattendue: {result}")
+            else:
+                merged[section] = result
+        return merged
 
-    async def get_all_data(self) -> dict[str, Any]:
+    async def get_all_data(
+        self, sections: Iterable[str] = DATA_SECTIONS
+    ) -> dict[str, Any]:
         """Récupère toutes les données de l'élève en parallèle.
         
         Utilise F2/Lecons au lieu de F3 pour obtenir TOUTES les leçons
         sans avoir à spécifier de dates.
         
+        Args:
+            sections: Sections à récupérer (les endpoints désactivés ne
+                sont pas interrogés)
+        
         Returns:
             Dictionnaire avec toutes les données combinées
+            
+        Raises:
+            SaroolApiError: Si au moins un endpoint a échoué
         """
-        try:
-            # Récupérer toutes les données en parallèle
-            info, recap, lessons, user_data = await asyncio.gather(
-                self.get_student_info(),
-                self.get_student_recap(),
-                self.get_student_lessons(),  # Nouvelle méthode F2/Lecons
-                self.get_user_data(),
-                return_exceptions=True,
-            )
+        results = await self.get_sections(sections)
+
+        # Vérifier les erreurs
+        for data in results.values():
+            if isinstance(data, SaroolApiError):
+                raise SaroolApiError(
+                    f"Erreur lors de la récupération des données: {data}"
+                ) from data
 
-            # Vérifier les erreurs
-            for data in [info, recap, lessons, user_data]:
-                if isinstance(data, Exception):
-                    raise data
-
-            return {
-                "info": info,
-                "recap": recap,
-                "lessons": lessons,  # Leçons au lieu de planning
-                "user_data": user_data,
-            }
-        except Exception as err:
-            raise SaroolApiError(f"Erreur lors de la récupération des données: {err}") from err
\ No newline at end of file
+        return results
@@ -0,0 +1,145 @@
+"""Archive SQLite locale des leçons anciennes.
+
+Les leçons terminées depuis plus longtemps que l'horizon configuré sont
+retirées de la mémoire du coordinateur et conservées ici, indexées par date
+de début, moniteur et statut. Toutes les méthodes sont bloquantes et doivent
+être appelées dans l'exécuteur.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+from .lessons import SaroolLesson
+
+_LOGGER = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lessons (
+    key TEXT PRIMARY KEY,
+    start_ts REAL NOT NULL,
+    end_ts REAL NOT NULL,
+    instructor TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_lessons_start ON lessons (start_ts);
+CREATE INDEX IF NOT EXISTS idx_lessons_instructor ON lessons (instructor, start_ts);
+CREATE INDEX IF NOT EXISTS idx_lessons_status ON lessons (status, start_ts);
+"""
+
+
+class SaroolLessonArchive:
+    """Archive des leçons d'une entrée, dans un fichier SQLite."""
+
+    def __init__(self, path: str) -> None:
+        """Initialise l'archive (le fichier est ouvert par ``open``).
+
+        Args:
+            path: Chemin du fichier SQLite
+        """
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        # La connexion est partagée entre les threads de l'exécuteur
+        self._lock = threading.Lock()
+
+    def open(self) -> None:
+        """Ouvre (ou crée) la base et ses index."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Ferme la base."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def store(self, lessons: list[SaroolLesson]) -> None:
+        """Ajoute ou met à jour des leçons dans l'archive.
+
+        Args:
+            lessons: Leçons à archiver
+        """
+        if not lessons or self._conn is None:
+            return
+        rows = [
+            (
+                lesson.key,
+                lesson.start.timestamp(),
+                lesson.end.timestamp(),
+                lesson.formateur.casefold(),
+                lesson.status,
+                json.dumps(lesson.raw, ensure_ascii=False),
+            )
+            for lesson in lessons
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO lessons VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def query(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        instructor: str | None = None,
+        statuses: set[str] | None = None,
+    ) -> list[SaroolLesson]:
+        """Recherche les leçons archivées qui chevauchent une période.
+
+        Args:
+            start: Début de la période (optionnel)
+            end: Fin de la période (optionnel)
+            instructor: Nom du moniteur, insensible à la casse (optionnel)
+            statuses: Statuts acceptés (optionnel)
+
+        Returns:
+            Leçons correspondantes, triées par date de début
+        """
+        if self._conn is None:
+            return []
+
+        clauses: list[str] = []
+        params: list[object] = []
+        if end is not None:
+            clauses.append("start_ts <= ?")
+            params.append(end.timestamp())
+        if start is not None:
+            clauses.append("end_ts >= ?")
+            params.append(start.timestamp())
+        if instructor is not None:
+            clauses.append("instructor = ?")
+            params.append(instructor.strip().casefold())
+        if statuses is not None:
+            clauses.append(f"status IN ({', '.join('?' for _ in statuses)})")
+            params.extend(statuses)
+
+        sql = "SELECT payload FROM lessons"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY start_ts"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        lessons = []
+        for (payload,) in rows:
+            try:
+                lessons.append(SaroolLesson.from_api(json.loads(payload)))
+            except (ValueError, KeyError, TypeError) as err:
+                _LOGGER.debug("Leçon archivée illisible: %s", err)
+        return lessons
+
+    def count(self) -> int:
+        """Retourne le nombre de leçons archivées."""
+        if self._conn is None:
+            return 0
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM lessons").fetchone()[0]
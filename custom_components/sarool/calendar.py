@@ -1,5 +1,5 @@
 """Calendrier pour l'intégration Sarool."""
-from datetime import datetime, timedelta
+from datetime import datetime
 import logging
 from typing import Any
 
@@ -9,8 +9,9 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, SECTION_LESSONS, SECTION_RECAP, SECTION_UPCOMING
 from .coordinator import SaroolDataCoordinator
+from .lessons import ACTIVE_STATUSES, PARIS_TZ, SaroolLesson
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -43,7 +44,11 @@ class SaroolCalendar(CoordinatorEntity, CalendarEntity):
             coordinator: Coordinateur de données
             entry: Entrée de configuration
         """
-        super().__init__(coordinator)
+        # Ne notifier le calendrier que si les leçons ou la prochaine leçon changent
+        super().__init__(
+            coordinator,
+            context=frozenset({SECTION_LESSONS, SECTION_RECAP, SECTION_UPCOMING}),
+        )
         self._attr_unique_id = f"{entry.entry_id}_calendar"
         self._attr_name = "Planning Sarool"
         self._attr_icon = "mdi:calendar-clock"
@@ -54,26 +59,15 @@ class SaroolCalendar(CoordinatorEntity, CalendarEntity):
             "model": "Auto-école",
         }
 
-    def _get_all_lessons(self) -> list[dict[str, Any]]:
-        """Récupère et fusionne les leçons confirmées et prévisionnelles.
-
-        Les leçons confirmées viennent de F2/Lecons.
-        Les leçons prévisionnelles viennent de F2 -> Prestations (même appel API,
-        données déjà présentes dans le récap).
-
-        Returns:
-            Liste combinée de toutes les leçons
-        """
-        if not self.coordinator.data:
-            return []
-
-        lessons_data = self.coordinator.data.get("lessons", {})
-        recap_data = self.coordinator.data.get("recap", {})
-
-        lecons_confirmees = lessons_data.get("Lecons", [])
-        lecons_previsionnelles = recap_data.get("Prestations", [])
+    @property
+    def available(self) -> bool:
+        """Indique si le calendrier est disponible (leçons encore servies)."""
+        return self.coordinator.section_available(SECTION_LESSONS) and super().available
 
-        return lecons_confirmees + lecons_previsionnelles
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Retourne l'âge des données et l'indicateur de données périmées."""
+        return self.coordinator.freshness_attributes()
 
     @property
     def event(self) -> CalendarEvent | None:
@@ -85,39 +79,10 @@ class SaroolCalendar(CoordinatorEntity, CalendarEntity):
         Returns:
             Le prochain événement ou None
         """
-        lecons = self._get_all_lessons()
-
-        if not lecons:
-            return None
-
-        from zoneinfo import ZoneInfo
-        paris_tz = ZoneInfo("Europe/Paris")
-        now = datetime.now(paris_tz)
-
-        # Filtrer les leçons futures non annulées
-        future_lessons = []
-        for lecon in lecons:
-            try:
-                if lecon.get("IsAnnule", 0) == 1:
-                    continue
-
-                date_str = lecon["Date"]
-                lesson_date_naive = datetime.fromisoformat(date_str)
-                lesson_date = lesson_date_naive.replace(tzinfo=paris_tz)
-
-                if lesson_date > now:
-                    future_lessons.append((lecon, lesson_date))
-            except (ValueError, KeyError) as e:
-                _LOGGER.debug(f"Erreur parsing leçon: {e}")
-                continue
-
-        if not future_lessons:
+        next_lesson = self.coordinator.timeline.next_lesson(datetime.now(PARIS_TZ))
+        if next_lesson is None:
             return None
 
-        # Trier et prendre la première
-        future_lessons.sort(key=lambda x: x[1])
-        next_lesson = future_lessons[0][0]
-
         return self._convert_lesson_to_event(next_lesson)
 
     async def async_get_events(
@@ -126,7 +91,10 @@ class SaroolCalendar(CoordinatorEntity, CalendarEntity):
         """Retourne les événements entre deux dates.
 
         Cette méthode est appelée par Home Assistant pour afficher
-        les événements dans le calendrier.
+        les événements dans le calendrier. Les leçons étant déjà triées
+        dans la chronologie du coordinateur, seule la fenêtre demandée
+        est parcourue. Les fenêtres antérieures à l'horizon de
+        conservation sont complétées par l'archive SQLite (exécuteur).
 
         Args:
             hass: Instance Home Assistant
@@ -136,63 +104,26 @@ class SaroolCalendar(CoordinatorEntity, CalendarEntity):
         Returns:
             Liste des événements dans la période demandée
         """
-        lecons = self._get_all_lessons()
-
-        from zoneinfo import ZoneInfo
-        paris_tz = ZoneInfo("Europe/Paris")
-
-        # Filtrer les leçons dans la période demandée
-        events = []
-        for lecon in lecons:
-            try:
-                # Ignorer les leçons annulées
-                if lecon.get("IsAnnule", 0) == 1:
-                    continue
-
-                date_str = lecon["Date"]
-                duree = lecon.get("Duree", 60)  # Durée en minutes
-
-                lesson_start_naive = datetime.fromisoformat(date_str)
-                lesson_start = lesson_start_naive.replace(tzinfo=paris_tz)
-                lesson_end = lesson_start + timedelta(minutes=duree)
+        lessons = await self.coordinator.async_query_lessons(
+            start_date, end_date, statuses=ACTIVE_STATUSES
+        )
+        return [self._convert_lesson_to_event(lesson) for lesson in lessons]
 
-                # Vérifier si la leçon est dans la période
-                if lesson_start <= end_date and lesson_end >= start_date:
-                    events.append(self._convert_lesson_to_event(lecon))
-            except (ValueError, KeyError) as e:
-                _LOGGER.debug(f"Erreur parsing leçon pour calendrier: {e}")
-                continue
-
-        return events
-
-    def _convert_lesson_to_event(self, lecon: dict[str, Any]) -> CalendarEvent:
+    def _convert_lesson_to_event(self, lesson: SaroolLesson) -> CalendarEvent:
         """Convertit une leçon Sarool en événement de calendrier.
 
         Args:
-            lecon: Dictionnaire représentant une leçon Sarool (confirmée ou prévisionnelle)
+            lesson: Leçon Sarool parsée (confirmée ou prévisionnelle)
 
         Returns:
             CalendarEvent pour Home Assistant
         """
-        from zoneinfo import ZoneInfo
-
-        # Timezone française (l'API retourne des dates locales françaises)
-        paris_tz = ZoneInfo("Europe/Paris")
-
-        # Parser la date
-        date_str = lecon["Date"]
-        duree = lecon.get("Duree", 60)  # Durée en minutes
-
-        start_naive = datetime.fromisoformat(date_str)
-        start = start_naive.replace(tzinfo=paris_tz)
-        end = start + timedelta(minutes=duree)
-
         # Détecter si c'est une leçon prévisionnelle (via le libellé Sarool)
-        libelle = (lecon.get("Libelle") or "Leçon de conduite").strip()
-        is_previsionnel = "prévisionnel" in libelle.lower()
+        libelle = lesson.libelle or "Leçon de conduite"
+        is_previsionnel = lesson.previsionnel
 
-        formateur = lecon.get("Formateur", "")
-        numero = lecon.get("Numero", "")
+        formateur = lesson.formateur
+        numero = lesson.numero
 
         # Construire le titre
         if is_previsionnel:
@@ -205,22 +136,22 @@ class SaroolCalendar(CoordinatorEntity, CalendarEntity):
         # Déterminer le lieu : si un commentaire existe, c'est que la leçon
         # a lieu ailleurs qu'à l'auto-école (ex: "gare"). Sinon, par défaut,
         # c'est à l'auto-école.
-        commentaire = (lecon.get("Commentaire") or "").strip()
+        commentaire = lesson.commentaire
         location = commentaire.capitalize() if commentaire else "Auto-école"
 
         # Construire la description
         description_parts = []
         if is_previsionnel:
             description_parts.append("⚠️ Créneau prévisionnel, pas encore confirmé")
-        if lecon.get("SuiviPedago"):
-            description_parts.append(f"Suivi: {lecon['SuiviPedago']}")
+        if lesson.raw.get("SuiviPedago"):
+            description_parts.append(f"Suivi: {lesson.raw['SuiviPedago']}")
 
         description = "\n".join(description_parts) if description_parts else None
 
         return CalendarEvent(
-            start=start,
-            end=end,
+            start=lesson.start,
+            end=lesson.end,
             summary=title,
             description=description,
             location=location,
-        )
\ No newline at end of file
+        )
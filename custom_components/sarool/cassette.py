@@ -0,0 +1,248 @@
+"""Enregistrement et rejeu des réponses de l'API Sarool (cassettes).
+
+Une cassette est un fichier JSON versionné contenant les réponses d'un
+rafraîchissement, anonymisées (NEPH, noms, clés PK/UK, mémo), avec leur
+durée. Le transport de rejeu les resert avec la même latence, ce qui permet
+de mesurer les performances hors ligne sur des données de forme réaliste.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+from typing import Any
+from urllib.parse import urlsplit
+
+_LOGGER = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+CASSETTE_MAX_FILES = 20  # Cassettes conservées par entrée
+
+# Clés remplacées par un pseudonyme stable (même valeur -> même pseudonyme),
+# pour que les regroupements par moniteur restent représentatifs. Le
+# pseudonyme est un HMAC avec une clé secrète de l'enregistreur, jamais
+# écrite : un simple hachage se retrouverait à partir d'une liste de noms.
+_PSEUDONYMIZED_KEYS = {
+    "Nom",
+    "Prenom",
+    "NomPrenom",
+    "Formateur",
+    "MoniteurReferent",
+    "Email",
+    "Telephone",
+    "Adresse",
+    "Identifiant",
+}
+# Clés dont le contenu est masqué en conservant sa taille
+_MASKED_KEYS = {"NEPH", "Memo", "PK", "UK", "MotDePasse", "PushToken"}
+
+
+class CassetteError(Exception):
+    """Exception levée pour une cassette illisible ou d'une version inconnue."""
+
+
+def sanitize(value: Any, secret: bytes, key: str | None = None) -> Any:
+    """Anonymise récursivement une réponse de l'API.
+
+    Args:
+        value: Valeur JSON décodée
+        secret: Clé secrète des pseudonymes
+        key: Clé parente de la valeur
+
+    Returns:
+        Copie anonymisée de la valeur
+    """
+    if isinstance(value, dict):
+        return {k: sanitize(v, secret, k) for k, v in value.items()}
+    if isinstance(value, list):
+        return [sanitize(item, secret, key) for item in value]
+    if not isinstance(value, str) or not value:
+        return value
+    if key in _MASKED_KEYS:
+        return "0" * len(value) if value.isdigit() else "x" * len(value)
+    if key in _PSEUDONYMIZED_KEYS:
+        digest = hmac.new(secret, value.encode(), hashlib.sha256).hexdigest()[:8]
+        return f"{key}-{digest}"
+    return value
+
+
+class SaroolCassetteRecorder:
+    """Capture les réponses du client API et les écrit en cassettes."""
+
+    def __init__(
+        self, directory: str, executor: Callable[..., Awaitable[Any]]
+    ) -> None:
+        """Initialise l'enregistreur.
+
+        Args:
+            directory: Dossier des cassettes de l'entrée
+            executor: Fonction d'exécution hors boucle (écriture, anonymisation)
+        """
+        self._directory = directory
+        self._executor = executor
+        self._interactions: list[dict[str, Any]] = []
+        # Clé des pseudonymes, gardée en mémoire : les pseudonymes sont
+        # stables entre les cassettes d'une même session uniquement
+        self._secret = secrets.token_bytes(32)
+
+    def record(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, str] | None,
+        status: int,
+        elapsed: float,
+        body: bytes,
+    ) -> None:
+        """Mémorise une réponse (l'anonymisation est faite à l'écriture).
+
+        Args:
+            method: Méthode HTTP
+            path: Chemin de l'endpoint
+            params: Paramètres de la requête
+            status: Code HTTP
+            elapsed: Durée de la requête (secondes)
+            body: Corps brut de la réponse
+        """
+        self._interactions.append(
+            {
+                "method": method,
+                "path": path,
+                "params": params or {},
+                "status": status,
+                "elapsed_ms": round(elapsed * 1000, 3),
+                "body": body,
+            }
+        )
+
+    async def async_save(self) -> str | None:
+        """Écrit les réponses capturées dans une nouvelle cassette.
+
+        Returns:
+            Chemin de la cassette, ou None si rien n'a été capturé
+        """
+        if not self._interactions:
+            return None
+        interactions, self._interactions = self._interactions, []
+        return await self._executor(self._write, interactions)
+
+    def _write(self, interactions: list[dict[str, Any]]) -> str | None:
+        """Anonymise et écrit une cassette, puis purge les plus anciennes."""
+        for interaction in interactions:
+            body = interaction.pop("body")
+            try:
+                interaction["json"] = sanitize(json.loads(body), self._secret) if body else None
+            except ValueError:
+                interaction["json"] = None
+            interaction["size"] = len(body)
+
+        cassette = {
+            "version": CASSETTE_VERSION,
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "interactions": interactions,
+        }
+        path = os.path.join(
+            self._directory, f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.json"
+        )
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(cassette, file, ensure_ascii=False)
+            cassettes = sorted(
+                name for name in os.listdir(self._directory) if name.endswith(".json")
+            )
+            for name in cassettes[:-CASSETTE_MAX_FILES]:
+                os.remove(os.path.join(self._directory, name))
+        except OSError as err:
+            _LOGGER.warning("Impossible d'écrire la cassette Sarool %s: %s", path, err)
+            return None
+        return path
+
+
+def load_cassette(path: str) -> dict[str, Any]:
+    """Charge une cassette en vérifiant sa version.
+
+    Raises:
+        CassetteError: Si le fichier est illisible ou d'une version inconnue
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            cassette = json.load(file)
+    except (OSError, ValueError) as err:
+        raise CassetteError(f"Cassette illisible {path}: {err}") from err
+    if cassette.get("version") != CASSETTE_VERSION:
+        raise CassetteError(
+            f"Version de cassette non supportée: {cassette.get('version')}"
+        )
+    return cassette
+
+
+class _ReplayResponse:
+    """Réponse rejouée, compatible avec l'usage de ClientResponse par le client."""
+
+    def __init__(self, interaction: dict[str, Any], speed: float) -> None:
+        self.status = interaction["status"]
+        self._interaction = interaction
+        self._delay = interaction["elapsed_ms"] / 1000 / speed if speed else 0.0
+        body = interaction.get("json")
+        self._body = b"" if body is None else json.dumps(body).encode()
+
+    async def __aenter__(self) -> _ReplayResponse:
+        if self._delay:
+            await asyncio.sleep(self._delay)
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def json(self) -> Any:
+        return json.loads(self._body) if self._body else None
+
+
+class SaroolReplaySession:
+    """Transport de rejeu remplaçant la session aiohttp du client API.
+
+    Les réponses d'un même endpoint sont resservies dans l'ordre
+    d'enregistrement, en boucle, avec la durée enregistrée divisée par
+    ``speed`` (0 pour désactiver l'attente).
+    """
+
+    def __init__(self, cassette: dict[str, Any], speed: float = 1.0) -> None:
+        """Initialise le transport.
+
+        Args:
+            cassette: Cassette chargée par ``load_cassette``
+            speed: Facteur d'accélération de la latence enregistrée
+        """
+        self._speed = speed
+        self._responses: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        self._positions: dict[tuple[str, str], int] = {}
+        for interaction in cassette["interactions"]:
+            key = (interaction["method"], interaction["path"])
+            self._responses.setdefault(key, []).append(interaction)
+
+    def _respond(self, method: str, url: str) -> _ReplayResponse:
+        key = (method, urlsplit(url).path)
+        responses = self._responses.get(key)
+        if not responses:
+            raise CassetteError(f"Aucune réponse enregistrée pour {method} {key[1]}")
+        position = self._positions.get(key, 0)
+        self._positions[key] = position + 1
+        return _ReplayResponse(responses[position % len(responses)], self._speed)
+
+    def get(self, url: str, **kwargs: Any) -> _ReplayResponse:
+        """Rejoue une requête GET."""
+        return self._respond("GET", url)
+
+    def post(self, url: str, **kwargs: Any) -> _ReplayResponse:
+        """Rejoue une requête POST."""
+        return self._respond("POST", url)
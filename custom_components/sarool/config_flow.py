@@ -7,18 +7,45 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api import SaroolApiClient, SaroolApiError
 from .const import (
+    CONF_ARCHIVE_HORIZON,
     CONF_DEVICE_NAME,
+    CONF_ENABLE_ANALYTICS,
+    CONF_ENABLE_CALENDAR,
+    CONF_FETCH_INFO,
+    CONF_FETCH_NOTIFICATIONS,
+    CONF_MAX_STALENESS,
+    CONF_NEXT_LESSONS_COUNT,
     CONF_PK,
+    CONF_PROFILE,
+    CONF_RECORD_CASSETTES,
+    CONF_REMINDER_OFFSETS,
+    CONF_TRACE_EXPORT,
     CONF_UK,
+    CONF_UPDATE_INTERVAL,
+    DEFAULT_ARCHIVE_HORIZON,
     DEFAULT_DEVICE_NAME,
+    DEFAULT_ENABLE_ANALYTICS,
+    DEFAULT_ENABLE_CALENDAR,
+    DEFAULT_FETCH_INFO,
+    DEFAULT_FETCH_NOTIFICATIONS,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_NEXT_LESSONS_COUNT,
+    DEFAULT_PROFILE,
+    DEFAULT_RECORD_CASSETTES,
+    DEFAULT_REMINDER_OFFSETS,
+    DEFAULT_TRACE_EXPORT,
+    DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
+    PROFILES,
 )
+from .reminders import parse_reminder_offsets
+from .tracing import TRACE_EXPORTS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,6 +55,14 @@ class SaroolConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Retourne le flux d'options de l'intégration."""
+        return SaroolOptionsFlow(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -101,3 +136,101 @@ class SaroolConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 "device_name": "Nom du périphérique (optionnel)",
             },
         )
+
+
+class SaroolOptionsFlow(config_entries.OptionsFlow):
+    """Gère les options de l'intégration Sarool."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialise le flux d'options.
+        
+        Args:
+            config_entry: Entrée de configuration à modifier
+        """
+        self.entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Affiche et enregistre les options.
+        
+        Args:
+            user_input: Options saisies par l'utilisateur
+            
+        Returns:
+            Résultat du flux d'options
+        """
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            # Validé ici : un validateur personnalisé dans le schéma empêche
+            # le frontend d'afficher le formulaire
+            try:
+                parse_reminder_offsets(user_input.get(CONF_REMINDER_OFFSETS, ""))
+            except ValueError:
+                errors[CONF_REMINDER_OFFSETS] = "invalid_reminder_offsets"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        # Après une erreur, réafficher les valeurs saisies
+        options = {**self.entry.options, **(user_input or {})}
+        data_schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_UPDATE_INTERVAL,
+                    default=options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+                vol.Optional(
+                    CONF_PROFILE,
+                    default=options.get(CONF_PROFILE, DEFAULT_PROFILE),
+                ): vol.In(PROFILES),
+                vol.Optional(
+                    CONF_FETCH_INFO,
+                    default=options.get(CONF_FETCH_INFO, DEFAULT_FETCH_INFO),
+                ): bool,
+                vol.Optional(
+                    CONF_FETCH_NOTIFICATIONS,
+                    default=options.get(
+                        CONF_FETCH_NOTIFICATIONS, DEFAULT_FETCH_NOTIFICATIONS
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_ENABLE_CALENDAR,
+                    default=options.get(CONF_ENABLE_CALENDAR, DEFAULT_ENABLE_CALENDAR),
+                ): bool,
+                vol.Optional(
+                    CONF_NEXT_LESSONS_COUNT,
+                    default=options.get(
+                        CONF_NEXT_LESSONS_COUNT, DEFAULT_NEXT_LESSONS_COUNT
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=50)),
+                vol.Optional(
+                    CONF_REMINDER_OFFSETS,
+                    default=options.get(CONF_REMINDER_OFFSETS, DEFAULT_REMINDER_OFFSETS),
+                ): str,
+                vol.Optional(
+                    CONF_ENABLE_ANALYTICS,
+                    default=options.get(CONF_ENABLE_ANALYTICS, DEFAULT_ENABLE_ANALYTICS),
+                ): bool,
+                vol.Optional(
+                    CONF_MAX_STALENESS,
+                    default=options.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+                vol.Optional(
+                    CONF_ARCHIVE_HORIZON,
+                    default=options.get(CONF_ARCHIVE_HORIZON, DEFAULT_ARCHIVE_HORIZON),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3650)),
+                vol.Optional(
+                    CONF_TRACE_EXPORT,
+                    default=options.get(CONF_TRACE_EXPORT, DEFAULT_TRACE_EXPORT),
+                ): vol.In(TRACE_EXPORTS),
+                vol.Optional(
+                    CONF_RECORD_CASSETTES,
+                    default=options.get(CONF_RECORD_CASSETTES, DEFAULT_RECORD_CASSETTES),
+                ): bool,
+            }
+        )
+
+        return self.async_show_form(
+            step_id="init", data_schema=data_schema, errors=errors
+        )
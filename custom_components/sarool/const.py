@@ -3,13 +3,14 @@
 # Domaine de l'intégration
 DOMAIN = "sarool"
 
-# URLs de l'API Sarool
+# URL de l'API Sarool et chemins des endpoints (relatifs à l'URL de base,
+# ce qui permet de pointer le client vers un serveur local de test)
 API_BASE_URL = "https://api.sarool.fr"
-API_PERIPHERIQUE = f"{API_BASE_URL}/Peripherique"
-API_F1 = f"{API_BASE_URL}/F1"
-API_F2 = f"{API_BASE_URL}/F2"
-API_F3 = f"{API_BASE_URL}/F3"
-API_UTILISATEUR = f"{API_BASE_URL}/Utilisateur"
+API_PERIPHERIQUE = "/Peripherique"
+API_F1 = "/F1"
+API_F2 = "/F2"
+API_F3 = "/F3"
+API_UTILISATEUR = "/Utilisateur"
 
 # Clés de configuration
 CONF_USERNAME = "username"
@@ -20,9 +21,109 @@ CONF_DEVICE_NAME = "device_name"
 CONF_PK = "pk"  # Clé périphérique
 CONF_UK = "uk"  # Clé utilisateur
 
-# Intervalle de mise à jour (en secondes)
+# Options (modifiables après l'ajout de l'intégration)
+CONF_ENABLE_ANALYTICS = "enable_analytics"  # Capteurs de progression
+DEFAULT_ENABLE_ANALYTICS = True
+CONF_TRACE_EXPORT = "trace_export"  # Export des traces : off, memory ou file
+DEFAULT_TRACE_EXPORT = "off"
+CONF_MAX_STALENESS = "max_staleness"  # Âge maximal des données servies (minutes)
+DEFAULT_MAX_STALENESS = 120
+CONF_RECORD_CASSETTES = "record_cassettes"  # Enregistrement des réponses API
+DEFAULT_RECORD_CASSETTES = False
+# Horizon (en jours) au-delà duquel les leçons passées sont archivées en SQLite
+# et retirées de la mémoire (0 pour tout garder en mémoire)
+CONF_ARCHIVE_HORIZON = "archive_horizon"
+DEFAULT_ARCHIVE_HORIZON = 90
+
+# Intervalle de mise à jour (en minutes) et sections récupérées
 # 5 minutes par défaut pour ne pas surcharger l'API
-UPDATE_INTERVAL = 300
+CONF_UPDATE_INTERVAL = "update_interval"
+DEFAULT_UPDATE_INTERVAL = 5
+CONF_PROFILE = "profile"  # Profil de récupération : complet ou allégé
+PROFILE_FULL = "full"
+PROFILE_LITE = "lite"  # Leçons et solde uniquement (F2 et F2/Lecons)
+PROFILES = [PROFILE_FULL, PROFILE_LITE]
+DEFAULT_PROFILE = PROFILE_FULL
+CONF_FETCH_INFO = "fetch_info"  # Infos de l'élève (F1)
+DEFAULT_FETCH_INFO = True
+CONF_FETCH_NOTIFICATIONS = "fetch_notifications"  # Notifications (Utilisateur/Donnees)
+DEFAULT_FETCH_NOTIFICATIONS = True
+CONF_ENABLE_CALENDAR = "enable_calendar"  # Entité calendrier
+DEFAULT_ENABLE_CALENDAR = True
+CONF_NEXT_LESSONS_COUNT = "next_lessons_count"  # Leçons du capteur « Prochaines leçons »
+DEFAULT_NEXT_LESSONS_COUNT = 5
+# Délais (minutes, séparés par des virgules) des événements de rappel avant
+# chaque leçon ; vide pour désactiver les rappels
+CONF_REMINDER_OFFSETS = "reminder_offsets"
+DEFAULT_REMINDER_OFFSETS = "1440, 60"
+# Options appliquées sans recharger l'entrée ; les autres modifient les
+# entités créées ou les objets construits au chargement (traceur, archive...)
+LIVE_OPTIONS = frozenset(
+    {
+        CONF_UPDATE_INTERVAL,
+        CONF_PROFILE,
+        CONF_FETCH_INFO,
+        CONF_FETCH_NOTIFICATIONS,
+        CONF_ENABLE_CALENDAR,
+        CONF_NEXT_LESSONS_COUNT,
+        CONF_REMINDER_OFFSETS,
+    }
+)
+# Valeur de chaque option quand elle n'a jamais été enregistrée
+OPTION_DEFAULTS = {
+    CONF_ENABLE_ANALYTICS: DEFAULT_ENABLE_ANALYTICS,
+    CONF_TRACE_EXPORT: DEFAULT_TRACE_EXPORT,
+    CONF_MAX_STALENESS: DEFAULT_MAX_STALENESS,
+    CONF_RECORD_CASSETTES: DEFAULT_RECORD_CASSETTES,
+    CONF_ARCHIVE_HORIZON: DEFAULT_ARCHIVE_HORIZON,
+    CONF_UPDATE_INTERVAL: DEFAULT_UPDATE_INTERVAL,
+    CONF_PROFILE: DEFAULT_PROFILE,
+    CONF_FETCH_INFO: DEFAULT_FETCH_INFO,
+    CONF_FETCH_NOTIFICATIONS: DEFAULT_FETCH_NOTIFICATIONS,
+    CONF_ENABLE_CALENDAR: DEFAULT_ENABLE_CALENDAR,
+    CONF_NEXT_LESSONS_COUNT: DEFAULT_NEXT_LESSONS_COUNT,
+    CONF_REMINDER_OFFSETS: DEFAULT_REMINDER_OFFSETS,
+}
+
+# Signal envoyé au déchargement d'une entrée (formaté avec l'entry_id), qui
+# termine les abonnements websocket liés à son coordinateur
+SIGNAL_ENTRY_UNLOADED = "sarool_entry_unloaded_{}"
+
+# Dossier (dans le dossier de configuration) des traces exportées en JSONL
+TRACE_DIR = "sarool_traces"
+# Dossier des cassettes (réponses anonymisées) enregistrées pour les benchmarks
+CASSETTE_DIR = "sarool_cassettes"
+# Dossier des archives SQLite des leçons (un fichier par entrée)
+ARCHIVE_DIR = "sarool_archive"
+# Dossier des profils écrits par le service sarool.profile
+PROFILE_DIR = "sarool_profiles"
+
+# Premier délai de nouvel essai (en secondes) quand l'API est indisponible,
+# doublé à chaque échec jusqu'à l'intervalle de mise à jour
+STALE_RETRY_INTERVAL = 30
+# Premier délai (en secondes) avant de réessayer seules les sections en échec
+SECTION_RETRY_INTERVAL = 30
+
+# Seuils de déport dans l'exécuteur (hors boucle d'événements).
+# En dessous, le travail reste dans la boucle car le passage par l'exécuteur
+# coûte plus cher que le traitement lui-même. Le temps de blocage mesuré à
+# chaque rafraîchissement est visible dans les diagnostics pour ajuster ces valeurs.
+JSON_OFFLOAD_THRESHOLD = 128 * 1024  # Taille d'une réponse JSON (octets)
+TIMELINE_OFFLOAD_THRESHOLD = 500  # Nombre de leçons à parser et trier
+
+# Fuseau horaire des dates renvoyées par l'API (dates locales sans fuseau)
+SAROOL_TIMEZONE = "Europe/Paris"
+
+# Sections des données du coordinateur. Chaque entité déclare celles dont
+# elle dépend pour n'être notifiée que lorsqu'elles changent.
+SECTION_INFO = "info"  # F1
+SECTION_RECAP = "recap"  # F2 (soldes, prestations prévisionnelles)
+SECTION_LESSONS = "lessons"  # F2/Lecons
+SECTION_USER_DATA = "user_data"  # Utilisateur/Donnees
+SECTION_UPCOMING = "upcoming"  # Dérivée : prochaine leçon, leçons passées
+DATA_SECTIONS = (SECTION_INFO, SECTION_RECAP, SECTION_LESSONS, SECTION_USER_DATA)
+ALL_SECTIONS = (*DATA_SECTIONS, SECTION_UPCOMING)
+TIMELINE_SECTIONS = frozenset({SECTION_RECAP, SECTION_LESSONS})
 
 # Attributs des capteurs
 ATTR_NEPH = "neph"
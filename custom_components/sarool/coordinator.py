@@ -1,51 +1,815 @@
 """Coordinateur de données pour l'intégration Sarool."""
+import asyncio
 import logging
-from datetime import timedelta
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .api import SaroolApiClient, SaroolApiError
-from .const import DOMAIN, UPDATE_INTERVAL
+from .analytics import SaroolProgressTracker
+from .archive import SaroolLessonArchive
+from .profiler import profiled
+from .reminders import SaroolReminderScheduler, parse_reminder_offsets
+from .const import (
+    ALL_SECTIONS,
+    CONF_ARCHIVE_HORIZON,
+    CONF_ENABLE_ANALYTICS,
+    CONF_FETCH_INFO,
+    CONF_FETCH_NOTIFICATIONS,
+    CONF_MAX_STALENESS,
+    CONF_PROFILE,
+    CONF_REMINDER_OFFSETS,
+    CONF_UPDATE_INTERVAL,
+    DATA_SECTIONS,
+    DEFAULT_ARCHIVE_HORIZON,
+    DEFAULT_ENABLE_ANALYTICS,
+    DEFAULT_FETCH_INFO,
+    DEFAULT_FETCH_NOTIFICATIONS,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_PROFILE,
+    DEFAULT_REMINDER_OFFSETS,
+    DEFAULT_UPDATE_INTERVAL,
+    DOMAIN,
+    PROFILE_LITE,
+    SECTION_INFO,
+    SECTION_LESSONS,
+    SECTION_RECAP,
+    SECTION_RETRY_INTERVAL,
+    SECTION_UPCOMING,
+    SECTION_USER_DATA,
+    STALE_RETRY_INTERVAL,
+    TIMELINE_SECTIONS,
+    TIMELINE_OFFLOAD_THRESHOLD,
+)
+from .lessons import (
+    LessonDelta,
+    SaroolLesson,
+    SaroolTimeline,
+    build_timeline,
+    count_lessons,
+    diff_timelines,
+    split_timeline,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def enabled_sections(options: dict[str, Any]) -> tuple[str, ...]:
+    """Retourne les sections à récupérer selon les options de l'entrée.
+
+    Le profil allégé ne récupère que les leçons et le récapitulatif (solde),
+    quelles que soient les autres options.
+
+    Args:
+        options: Options de l'entrée de configuration
+
+    Returns:
+        Sections à récupérer, dans l'ordre de DATA_SECTIONS
+    """
+    enabled = {SECTION_RECAP, SECTION_LESSONS}
+    if options.get(CONF_PROFILE, DEFAULT_PROFILE) != PROFILE_LITE:
+        if options.get(CONF_FETCH_INFO, DEFAULT_FETCH_INFO):
+            enabled.add(SECTION_INFO)
+        if options.get(CONF_FETCH_NOTIFICATIONS, DEFAULT_FETCH_NOTIFICATIONS):
+            enabled.add(SECTION_USER_DATA)
+    return tuple(section for section in DATA_SECTIONS if section in enabled)
+
+
 class SaroolDataCoordinator(DataUpdateCoordinator):
     """Classe pour gérer la récupération des données depuis l'API Sarool."""
 
-    def __init__(self, hass: HomeAssistant, api_client: SaroolApiClient) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api_client: SaroolApiClient,
+        entry: ConfigEntry,
+        archive: SaroolLessonArchive | None = None,
+    ) -> None:
         """Initialise le coordinateur.
-        
+
         Args:
             hass: Instance Home Assistant
             api_client: Client API Sarool
+            entry: Entrée de configuration (options)
+            archive: Archive SQLite des leçons anciennes (optionnelle)
         """
         self.api_client = api_client
-        
+        self.entry = entry
+        # Options appliquées (comparées aux nouvelles par l'écouteur de l'entrée)
+        self.options = dict(entry.options)
+        # Sections récupérées (profil et options de récupération)
+        self.sections = enabled_sections(self.options)
+        self.tracer = api_client.tracer
+        # Trace et span du dernier rafraîchissement, pour y rattacher la
+        # mise à jour des entités qui a lieu après _async_update_data
+        self._refresh_span: tuple[str, str] | None = None
+        # Leçons parsées et triées, partagées par le calendrier et les capteurs
+        self.timeline = SaroolTimeline([])
+        # Différences de leçons du dernier rafraîchissement
+        self.last_delta = LessonDelta()
+        # Statistiques de progression (désactivables dans les options)
+        self.progress: SaroolProgressTracker | None = None
+        if entry.options.get(CONF_ENABLE_ANALYTICS, DEFAULT_ENABLE_ANALYTICS):
+            self.progress = SaroolProgressTracker()
+        # Mesures de performance du dernier rafraîchissement (diagnostics)
+        self.perf_stats: dict[str, Any] = {
+            "loop_blocking_ms": 0.0,
+            "max_loop_blocking_ms": 0.0,
+            "timeline_offloaded": False,
+            "offloaded_decodes": 0,
+            "reused_decodes": 0,
+            "lesson_count": 0,
+            "archived_lessons": 0,
+        }
+
+        # Leçons terminées avant l'horizon : archivées et retirées de la mémoire
+        self.archive = archive
+        self._archive_horizon = timedelta(
+            days=entry.options.get(CONF_ARCHIVE_HORIZON, DEFAULT_ARCHIVE_HORIZON)
+        )
+        self.archive_cutoff: datetime | None = None
+
+        # Rappels avant les leçons, replanifiés à partir des différences
+        self.reminders = SaroolReminderScheduler(
+            hass, entry.entry_id, self._reminder_offsets(self.options)
+        )
+
+        # Suppression des notifications sans changement (voir async_update_listeners)
+        self._changed_sections: set[str] | None = None
+        self._last_notified_success = True
+        self._upcoming_marker_value: tuple[Any, ...] | None = None
+        self.update_stats: dict[str, Any] = {
+            "refreshes": 0,
+            "skipped_refreshes": 0,
+            "skipped_listener_calls": 0,
+            "section_changes": dict.fromkeys(ALL_SECTIONS, 0),
+            "section_unchanged": dict.fromkeys(ALL_SECTIONS, 0),
+        }
+
+        # Stale-while-revalidate : dernières données servies pendant une panne
+        self._base_interval = timedelta(
+            minutes=self.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
+        )
+        self._failures = 0
+        self.last_success_time: datetime | None = None
+        self.stale = False
+
+        # Santé de chaque section ; les sections en échec sont réessayées seules
+        self.section_health: dict[str, dict[str, Any]] = {
+            section: {
+                "ok": True,
+                "last_success": None,
+                "last_error": None,
+                "consecutive_failures": 0,
+                "total_failures": 0,
+            }
+            for section in DATA_SECTIONS
+        }
+        self._retry_unsub: CALLBACK_TYPE | None = None
+        # Empêche un nouvel essai partiel de croiser un rafraîchissement complet
+        self._fetch_lock = asyncio.Lock()
+
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=UPDATE_INTERVAL),
+            update_interval=self._base_interval,
         )
 
     async def _async_update_data(self):
         """Récupère les données depuis l'API.
-        
+
         Cette méthode est appelée automatiquement par Home Assistant
-        selon l'intervalle défini (UPDATE_INTERVAL).
-        
+        selon l'intervalle défini dans les options. Seules les sections
+        activées (``self.sections``) sont récupérées.
+
+        Chaque section est validée indépendamment : une section en échec
+        conserve sa valeur précédente et est réessayée seule (voir
+        ``_async_retry_sections``) sans bloquer les autres.
+
         Returns:
             Dictionnaire avec toutes les données de l'élève
-            
+
         Raises:
-            UpdateFailed: Si la mise à jour échoue
-        """
-        try:
-            _LOGGER.debug("Récupération des données Sarool")
-            data = await self.api_client.get_all_data()
-            _LOGGER.debug("Données Sarool récupérées avec succès")
-            return data
-        except SaroolApiError as err:
+            UpdateFailed: Si la mise à jour échoue et que les dernières
+                données sont trop anciennes pour être servies
+        """
+        async with self._fetch_lock:
+            with self.tracer.span("coordinator.refresh") as span:
+                if span is not None:
+                    self._refresh_span = (span.trace_id, span.span_id)
+
+                try:
+                    _LOGGER.debug("Récupération des données Sarool")
+                    results = await self.api_client.get_sections(self.sections)
+                finally:
+                    self._async_save_cassette()
+
+                failed_before = self._failed_sections()
+                fetched, errors = self._record_section_results(results)
+                if not fetched:
+                    # Toutes les sections ont échoué
+                    data = dict(self._serve_stale(next(iter(errors.values()))))
+                    if self._drop_expired_sections(data, errors):
+                        await self._async_process(data)
+                    return data
+                _LOGGER.debug(
+                    "Données Sarool récupérées (%s)%s",
+                    ", ".join(fetched),
+                    f", en échec: {', '.join(errors)}" if errors else "",
+                )
+
+                # Au premier rafraîchissement, les sections en échec sont
+                # simplement absentes (entités indisponibles, voir
+                # section_available) jusqu'à ce que le nouvel essai réussisse
+                data = {**(self.data or {}), **fetched}
+                self._drop_expired_sections(data, errors)
+                self._changed_sections = await self._async_process(data)
+                if self._failed_sections() != failed_before:
+                    # Attribut failed_sections modifié : toutes les entités
+                    self._changed_sections = None
+                self._mark_fresh()
+                self._schedule_section_retry()
+                return data
+
+    async def _async_process(self, data: dict[str, Any]) -> set[str]:
+        """Met à jour la chronologie et les statistiques pour de nouvelles données.
+
+        Args:
+            data: Données fusionnées du coordinateur
+
+        Returns:
+            Sections modifiées (y compris la section dérivée « upcoming »)
+        """
+        now = dt_util.now()
+        changed = self._changed_sections_of(data)
+        if changed & TIMELINE_SECTIONS:
+            timeline = await self._async_build_timeline(data)
+            with self.tracer.span("timeline.diff"):
+                delta = diff_timelines(self.timeline, timeline)
+            if self.archive is not None and self._archive_horizon:
+                timeline = await self._async_archive_lessons(data, timeline, delta, now)
+            self.last_delta = delta
+            self.timeline = timeline
+        else:
+            # Leçons et récap identiques : chronologie conservée telle quelle
+            self._record_blocking_time(self.api_client.pop_blocking_time())
+            self.last_delta = LessonDelta()
+
+        if self.progress is not None:
+            self.progress.apply(self.last_delta, now)
+        self.reminders.async_apply(self.last_delta, now)
+
+        # Section dérivée : la prochaine leçon ou les leçons effectuées
+        # changent avec le temps, même si l'API renvoie les mêmes données
+        upcoming_marker = self._upcoming_marker(now)
+        if upcoming_marker != self._upcoming_marker_value:
+            changed.add(SECTION_UPCOMING)
+            self._upcoming_marker_value = upcoming_marker
+
+        self._count_section_changes(changed)
+        return changed
+
+    async def _async_archive_lessons(
+        self,
+        data: dict[str, Any],
+        timeline: SaroolTimeline,
+        delta: LessonDelta,
+        now: datetime,
+    ) -> SaroolTimeline:
+        """Archive les leçons terminées avant l'horizon et les retire de la mémoire.
+
+        La chronologie complète a été comparée à la chronologie élaguée
+        précédente : les leçons déjà archivées y apparaissent comme ajoutées
+        et sont retirées du delta. Toutes les leçons archivées que le suivi
+        de progression connaît (déjà en mémoire ou ajoutées par ce même
+        delta, notamment au premier rafraîchissement) sont signalées dans
+        ``delta.evicted`` pour qu'il les oublie (elles ne sont pas supprimées).
+        La section des leçons est remplacée par une copie élaguée, sans
+        modifier l'objet décodé d'origine.
+
+        Args:
+            data: Données fusionnées du coordinateur (section leçons remplacée)
+            timeline: Chronologie complète
+            delta: Différences avec la chronologie précédente (complété)
+            now: Heure courante
+
+        Returns:
+            Chronologie des leçons récentes
+        """
+        cutoff = now - self._archive_horizon
+        previous_cutoff = self.archive_cutoff
+        if previous_cutoff is not None:
+            delta.added = [l for l in delta.added if l.end >= previous_cutoff]
+
+        with self.tracer.span("archive.evict") as span:
+            if len(timeline) >= TIMELINE_OFFLOAD_THRESHOLD:
+                recent, old = await self.hass.async_add_executor_job(
+                    profiled(split_timeline), timeline, cutoff
+                )
+            else:
+                recent, old = split_timeline(timeline, cutoff)
+            if span is not None:
+                span.set(archived=len(old), kept=len(recent))
+            if old:
+                try:
+                    await self.hass.async_add_executor_job(profiled(self.archive.store), old)
+                except sqlite3.Error as err:
+                    # Sans archive fiable, garder tout l'historique en mémoire
+                    _LOGGER.warning("Impossible d'archiver les leçons Sarool: %s", err)
+                    return timeline
+
+        known = self.timeline.by_key
+        added = {l.key for l in delta.added}
+        delta.evicted = [l for l in old if l.key in known or l.key in added]
+
+        self.archive_cutoff = cutoff
+        self.perf_stats["archived_lessons"] = len(old)
+
+        lessons_data = data.get(SECTION_LESSONS)
+        if old and lessons_data:
+            archived = {id(l.raw) for l in old}
+            pruned = {
+                **lessons_data,
+                "Lecons": [
+                    lecon
+                    for lecon in lessons_data.get("Lecons") or []
+                    if id(lecon) not in archived
+                ],
+            }
+            self.api_client.replace_decoded(lessons_data, pruned)
+            data[SECTION_LESSONS] = pruned
+        return recent
+
+    async def async_query_lessons(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        instructor: str | None = None,
+        statuses: set[str] | None = None,
+    ) -> list[SaroolLesson]:
+        """Recherche des leçons en mémoire et, avant l'horizon, dans l'archive.
+
+        Args:
+            start: Début de la période (optionnel)
+            end: Fin de la période (optionnel)
+            instructor: Nom du moniteur, insensible à la casse (optionnel)
+            statuses: Statuts acceptés (optionnel, tous par défaut)
+
+        Returns:
+            Leçons correspondantes, triées par date de début
+        """
+        lessons = self.timeline.query(start, end, instructor, statuses)
+        cutoff = self.archive_cutoff
+        if self.archive is None or cutoff is None or (start is not None and start >= cutoff):
+            return lessons
+
+        archived = await self.hass.async_add_executor_job(
+            profiled(self.archive.query), start, end, instructor, statuses
+        )
+        known = self.timeline.by_key
+        merged = [l for l in archived if l.key not in known] + lessons
+        merged.sort(key=lambda l: l.start)
+        return merged
+
+    def _record_section_results(
+        self, results: dict[str, Any]
+    ) -> tuple[dict[str, Any], dict[str, SaroolApiError]]:
+        """Sépare les sections réussies des échecs et met à jour leur santé.
+
+        Args:
+            results: Résultats de ``SaroolApiClient.get_sections``
+
+        Returns:
+            Sections réussies et sections en échec
+        """
+        fetched: dict[str, Any] = {}
+        errors: dict[str, SaroolApiError] = {}
+        now = dt_util.utcnow()
+        for section, result in results.items():
+            health = self.section_health[section]
+            if isinstance(result, SaroolApiError):
+                errors[section] = result
+                health["ok"] = False
+                health["last_error"] = str(result)
+                health["consecutive_failures"] += 1
+                health["total_failures"] += 1
+            else:
+                fetched[section] = result
+                health["ok"] = True
+                health["last_success"] = now.isoformat()
+                health["consecutive_failures"] = 0
+        return fetched, errors
+
+    def _drop_expired_sections(
+        self, data: dict[str, Any], errors: dict[str, SaroolApiError]
+    ) -> set[str]:
+        """Retire les sections en échec depuis plus que l'âge maximal configuré.
+
+        Une section en échec conserve sa valeur précédente tant que son
+        dernier succès a moins de ``CONF_MAX_STALENESS`` ; au-delà, elle est
+        retirée des données et les entités qui en dépendent deviennent
+        indisponibles (voir ``section_available``).
+
+        Args:
+            data: Données fusionnées du coordinateur (modifiées en place)
+            errors: Sections en échec
+
+        Returns:
+            Sections retirées
+        """
+        max_age = timedelta(
+            minutes=self.entry.options.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS)
+        )
+        now = dt_util.utcnow()
+        expired = set()
+        for section in errors:
+            if section not in data:
+                continue
+            last_success = self.section_health[section]["last_success"]
+            if last_success is None or now - dt_util.parse_datetime(last_success) >= max_age:
+                expired.add(section)
+                del data[section]
+        if expired:
+            _LOGGER.warning(
+                "Sections Sarool en échec depuis plus de %s, données retirées: %s",
+                max_age,
+                ", ".join(sorted(expired)),
+            )
+        return expired
+
+    @callback
+    def _schedule_section_retry(self) -> None:
+        """Planifie un nouvel essai des seules sections en échec.
+
+        Le délai double à chaque échec consécutif ; s'il atteint l'intervalle
+        normal, le prochain rafraîchissement complet s'en charge.
+        """
+        if self._retry_unsub is not None:
+            self._retry_unsub()
+            self._retry_unsub = None
+
+        failures = [
+            health["consecutive_failures"]
+            for health in self.section_health.values()
+            if not health["ok"]
+        ]
+        if not failures:
+            return
+        delay = SECTION_RETRY_INTERVAL * 2 ** (max(failures) - 1)
+        if delay >= self._base_interval.total_seconds():
+            return
+        self._retry_unsub = async_call_later(
+            self.hass, delay, HassJob(self._async_retry_sections, cancel_on_shutdown=True)
+        )
+
+    async def _async_retry_sections(self, _now: datetime) -> None:
+        """Réessaie les sections en échec et publie celles qui ont réussi.
+
+        Les entités concernées sont notifiées sans replanifier le
+        rafraîchissement complet, y compris quand une section encore en
+        échec est retirée des données faute de succès assez récent.
+        """
+        self._retry_unsub = None
+        failed = [section for section, health in self.section_health.items() if not health["ok"]]
+        if not failed or self.data is None:
+            return
+
+        async with self._fetch_lock:
+            with self.tracer.span("coordinator.retry_sections", sections=failed) as span:
+                if span is not None:
+                    self._refresh_span = (span.trace_id, span.span_id)
+                try:
+                    results = await self.api_client.get_sections(failed)
+                finally:
+                    self._async_save_cassette()
+
+                fetched, errors = self._record_section_results(results)
+                data = {**self.data, **fetched}
+                expired = self._drop_expired_sections(data, errors)
+                if fetched or expired:
+                    if fetched:
+                        _LOGGER.debug("Sections Sarool rétablies: %s", ", ".join(fetched))
+                    changed = await self._async_process(data)
+                    self.data = data
+                    # Sections rétablies : l'attribut failed_sections de toutes
+                    # les entités change
+                    self._changed_sections = None if fetched else changed
+                    self.async_update_listeners()
+
+        self._schedule_section_retry()
+
+    @callback
+    def _async_save_cassette(self) -> None:
+        """Écrit une cassette des réponses capturées (mode enregistrement)."""
+        if self.api_client.recorder is not None:
+            self.entry.async_create_background_task(
+                self.hass,
+                self.api_client.recorder.async_save(),
+                "sarool_cassette_save",
+            )
+
+    async def async_apply_options(self, options: dict[str, Any]) -> None:
+        """Applique l'intervalle et les sections récupérées sans rechargement.
+
+        Les sections désactivées sont retirées des données (les entités qui
+        en dépendent deviennent indisponibles) ; les sections activées sont
+        récupérées immédiatement.
+
+        Args:
+            options: Nouvelles options de l'entrée
+        """
+        if self._reminder_offsets(options) != self._reminder_offsets(self.options):
+            self.reminders.async_reset(
+                self._reminder_offsets(options), self.timeline, dt_util.now()
+            )
+        self.options = dict(options)
+        self._base_interval = timedelta(
+            minutes=options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
+        )
+        if not self._failures:
+            # En panne, le délai de nouvel essai reste plafonné par _serve_stale
+            self.update_interval = self._base_interval
+
+        sections = enabled_sections(options)
+        added = set(sections) - set(self.sections)
+        removed = set(self.sections) - set(sections)
+        self.sections = sections
+        _LOGGER.debug(
+            "Options Sarool appliquées: intervalle %s, sections %s",
+            self._base_interval,
+            ", ".join(sections),
+        )
+
+        for section in removed:
+            self.section_health[section].update(ok=True, consecutive_failures=0)
+        if removed and self.data is not None:
+            self.data = {k: v for k, v in self.data.items() if k not in removed}
+        self._schedule_section_retry()
+
+        if added:
+            await self.async_refresh()
+        else:
+            # Disponibilité et intervalle modifiés : notifier toutes les entités
+            self._changed_sections = None
+            self.async_update_listeners()
+            # Replanifier selon le nouvel intervalle
+            self._schedule_refresh()
+
+    @staticmethod
+    def _reminder_offsets(options: dict[str, Any]) -> list[int]:
+        """Retourne les délais des rappels configurés (minutes)."""
+        return parse_reminder_offsets(
+            options.get(CONF_REMINDER_OFFSETS, DEFAULT_REMINDER_OFFSETS)
+        )
+
+    def section_available(self, section: str) -> bool:
+        """Indique si une section est récupérée et ses données encore servies.
+
+        Une section désactivée (profil et options) ou en échec depuis plus
+        que l'âge maximal n'a pas de données.
+        """
+        return section in self.sections and (self.data is None or section in self.data)
+
+    async def async_shutdown(self) -> None:
+        """Annule le nouvel essai et les rappels planifiés lors du déchargement."""
+        if self._retry_unsub is not None:
+            self._retry_unsub()
+            self._retry_unsub = None
+        self.reminders.async_cancel_all()
+        await super().async_shutdown()
+
+    def _serve_stale(self, err: SaroolApiError) -> dict[str, Any]:
+        """Continue de servir les dernières données pendant une panne de l'API.
+
+        Tant que les dernières données valides ont moins de l'âge maximal
+        configuré, elles restent servies (attribut ``stale``) et l'API est
+        réinterrogée avec un délai croissant. Au-delà, le rafraîchissement
+        échoue et les entités deviennent indisponibles.
+
+        Args:
+            err: Erreur de l'API
+
+        Returns:
+            Dernières données valides
+
+        Raises:
+            UpdateFailed: Si aucune donnée n'est disponible ou si elles sont trop anciennes
+        """
+        self._failures += 1
+        # Nouvel essai rapide, doublé à chaque échec, plafonné à l'intervalle normal
+        self.update_interval = min(
+            self._base_interval,
+            timedelta(seconds=STALE_RETRY_INTERVAL * 2 ** (self._failures - 1)),
+        )
+
+        max_age = timedelta(
+            minutes=self.entry.options.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS)
+        )
+        if (
+            self.data is None
+            or self.last_success_time is None
+            or dt_util.utcnow() - self.last_success_time >= max_age
+        ):
             raise UpdateFailed(f"Erreur lors de la mise à jour des données: {err}") from err
+
+        if not self.stale:
+            _LOGGER.warning(
+                "API Sarool indisponible (%s), dernières données conservées "
+                "(nouvel essai dans %s)",
+                err,
+                self.update_interval,
+            )
+        self.stale = True
+        # L'âge des données change : toutes les entités sont mises à jour
+        self._changed_sections = None
+        return self.data
+
+    def _mark_fresh(self) -> None:
+        """Enregistre un rafraîchissement réussi et rétablit l'intervalle normal."""
+        self.last_success_time = dt_util.utcnow()
+        if self._failures:
+            self._failures = 0
+            self.update_interval = self._base_interval
+        if self.stale:
+            _LOGGER.info("API Sarool de nouveau disponible")
+            self.stale = False
+            self._changed_sections = None
+
+    def freshness_attributes(self) -> dict[str, Any]:
+        """Retourne les attributs de fraîcheur communs à toutes les entités.
+
+        Returns:
+            Âge des données en secondes, indicateur de données périmées et
+            sections en échec (conservant leur valeur précédente)
+        """
+        data_age = None
+        if self.last_success_time is not None:
+            data_age = int((dt_util.utcnow() - self.last_success_time).total_seconds())
+        return {
+            "data_age": data_age,
+            "stale": self.stale,
+            "failed_sections": self._failed_sections(),
+        }
+
+    def _failed_sections(self) -> list[str]:
+        """Retourne les sections dont la dernière récupération a échoué."""
+        return [
+            section for section, health in self.section_health.items() if not health["ok"]
+        ]
+
+    def _changed_sections_of(self, data: dict[str, Any]) -> set[str]:
+        """Retourne les sections dont le contenu a changé.
+
+        Le client API réutilise l'objet décodé précédent quand l'empreinte
+        du corps de la réponse est identique : une simple comparaison
+        d'identité suffit donc, sans parcourir les données.
+        """
+        previous = self.data or {}
+        return {
+            section
+            for section in self.sections
+            if section not in previous or data.get(section) is not previous.get(section)
+        }
+
+    def _upcoming_marker(self, now: datetime) -> tuple[Any, ...]:
+        """Retourne un marqueur qui change quand l'état lié au temps change."""
+        next_lesson = self.timeline.next_lesson(now)
+        return (
+            next_lesson.key if next_lesson else None,
+            next_lesson.start if next_lesson else None,
+            self.progress.done_count if self.progress is not None else None,
+            self.progress.upcoming_count if self.progress is not None else None,
+        )
+
+    def _count_section_changes(self, changed: set[str]) -> None:
+        """Met à jour les compteurs de sections modifiées / inchangées."""
+        stats = self.update_stats
+        stats["refreshes"] += 1
+        for section in ALL_SECTIONS:
+            key = "section_changes" if section in changed else "section_unchanged"
+            stats[key][section] += 1
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notifie les entités concernées par les sections modifiées.
+
+        Chaque entité déclare en contexte les sections dont elle dépend.
+        Après un rafraîchissement réussi, seules celles dont une section a
+        changé sont notifiées, et aucune si rien n'a changé. Un changement
+        de disponibilité (échec, reprise) notifie toutes les entités.
+        """
+        changed = self._changed_sections
+        self._changed_sections = None
+        if self.last_update_success != self._last_notified_success:
+            changed = None
+        self._last_notified_success = self.last_update_success
+
+        if changed is not None and not changed:
+            self.update_stats["skipped_refreshes"] += 1
+            self._refresh_span = None
+            # Les spans du rafraîchissement sont écrits même sans notification
+            self._async_flush_traces()
+            return
+
+        if not self.tracer.enabled:
+            self._async_notify(changed)
+            return
+
+        trace_id, parent_id = self._refresh_span or (None, None)
+        with self.tracer.span(
+            "entities.update",
+            trace_id=trace_id,
+            parent_id=parent_id,
+            listeners=len(self._listeners),
+            sections=sorted(changed) if changed is not None else "all",
+        ):
+            self._async_notify(changed)
+        self._refresh_span = None
+        self._async_flush_traces()
+
+    @callback
+    def _async_flush_traces(self) -> None:
+        """Écrit les spans en attente dans le fichier de traces (mode file)."""
+        if self.tracer.enabled:
+            self.entry.async_create_background_task(
+                self.hass, self.tracer.async_flush(), "sarool_trace_flush"
+            )
+
+    @callback
+    def _async_notify(self, changed: set[str] | None) -> None:
+        """Appelle les listeners dont le contexte recoupe les sections modifiées.
+
+        Args:
+            changed: Sections modifiées, ou None pour notifier tout le monde
+        """
+        if changed is None:
+            super().async_update_listeners()
+            return
+
+        for update_callback, context in list(self._listeners.values()):
+            if isinstance(context, frozenset) and not context & changed:
+                self.update_stats["skipped_listener_calls"] += 1
+                continue
+            update_callback()
+
+    async def _async_build_timeline(self, data: dict[str, Any]) -> SaroolTimeline:
+        """Construit la chronologie des leçons, dans l'exécuteur si elle est grosse.
+
+        Met aussi à jour le temps de blocage de la boucle d'événements
+        (décodage JSON + chronologie) pour pouvoir ajuster les seuils.
+
+        Args:
+            data: Données retournées par l'API
+
+        Returns:
+            Chronologie des leçons
+        """
+        blocking = self.api_client.pop_blocking_time()
+        lesson_count = count_lessons(data)
+        offload = lesson_count >= TIMELINE_OFFLOAD_THRESHOLD
+
+        with self.tracer.span("timeline.build", lessons=lesson_count, offloaded=offload):
+            if offload:
+                timeline = await self.hass.async_add_executor_job(
+                    profiled(build_timeline), data
+                )
+            else:
+                start = time.perf_counter()
+                timeline = build_timeline(data)
+                blocking += time.perf_counter() - start
+
+        blocking_ms = self._record_blocking_time(blocking)
+        self.perf_stats.update(timeline_offloaded=offload, lesson_count=lesson_count)
+        _LOGGER.debug(
+            "Rafraîchissement Sarool: %d leçons, boucle bloquée %.2f ms (chronologie %s)",
+            lesson_count,
+            blocking_ms,
+            "dans l'exécuteur" if offload else "dans la boucle",
+        )
+        return timeline
+
+    def _record_blocking_time(self, blocking: float) -> float:
+        """Enregistre le temps de blocage de la boucle du rafraîchissement.
+
+        Args:
+            blocking: Temps de blocage en secondes
+
+        Returns:
+            Temps de blocage en millisecondes
+        """
+        blocking_ms = round(blocking * 1000, 3)
+        self.perf_stats.update(
+            loop_blocking_ms=blocking_ms,
+            max_loop_blocking_ms=max(self.perf_stats["max_loop_blocking_ms"], blocking_ms),
+            offloaded_decodes=self.api_client.offloaded_decodes,
+            reused_decodes=self.api_client.reused_decodes,
+        )
+        return blocking_ms
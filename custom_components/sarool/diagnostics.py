@@ -0,0 +1,73 @@
+"""Diagnostics pour l'intégration Sarool."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_PK, CONF_UK, DOMAIN
+from .coordinator import SaroolDataCoordinator
+
+# Données personnelles à masquer dans les diagnostics
+TO_REDACT = {
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    CONF_PK,
+    CONF_UK,
+    "NEPH",
+    "Nom",
+    "Prenom",
+    "Memo",
+    "title",
+    "unique_id",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Retourne les diagnostics d'une entrée de configuration.
+
+    Args:
+        hass: Instance Home Assistant
+        entry: Entrée de configuration
+
+    Returns:
+        Configuration masquée et mesures de performance du coordinateur
+    """
+    coordinator: SaroolDataCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "last_update_success": coordinator.last_update_success,
+        "freshness": coordinator.freshness_attributes(),
+        "update_interval": str(coordinator.update_interval),
+        "sections_enabled": list(coordinator.sections),
+        "sections": coordinator.section_health,
+        "reminders_scheduled": coordinator.reminders.scheduled_count,
+        "performance": dict(coordinator.perf_stats),
+        # Compteurs de notifications évitées (sections inchangées)
+        "updates": coordinator.update_stats,
+        "timeline": {
+            "lessons": len(coordinator.timeline),
+            "active": len(coordinator.timeline.active),
+        },
+        "archive": {
+            "enabled": coordinator.archive is not None,
+            "cutoff": (
+                coordinator.archive_cutoff.isoformat()
+                if coordinator.archive_cutoff
+                else None
+            ),
+            "lessons": (
+                await hass.async_add_executor_job(coordinator.archive.count)
+                if coordinator.archive is not None
+                else 0
+            ),
+        },
+        # Spans récents regroupés par trace (option d'export des traces)
+        "traces": coordinator.tracer.recent_traces(),
+    }
@@ -0,0 +1,326 @@
+"""Chronologie des leçons Sarool (parsing, fusion et tri)."""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from .const import SAROOL_TIMEZONE
+
+_LOGGER = logging.getLogger(__name__)
+
+# Statuts d'une leçon, utilisés comme filtres par le service get_lessons
+STATUS_CONFIRMED = "confirmed"
+STATUS_PREVISIONNEL = "previsionnel"
+STATUS_CANCELLED = "cancelled"
+STATUSES = [STATUS_CONFIRMED, STATUS_PREVISIONNEL, STATUS_CANCELLED]
+# Statuts affichés dans le calendrier (leçons non annulées)
+ACTIVE_STATUSES = frozenset({STATUS_CONFIRMED, STATUS_PREVISIONNEL})
+
+PARIS_TZ = ZoneInfo(SAROOL_TIMEZONE)
+
+
+@dataclass(frozen=True, slots=True)
+class SaroolLesson:
+    """Leçon Sarool (confirmée ou prévisionnelle) avec ses dates parsées."""
+
+    key: str
+    start: datetime
+    end: datetime
+    duree: int
+    libelle: str
+    formateur: str
+    numero: Any
+    commentaire: str
+    previsionnel: bool
+    annule: bool
+    raw: dict[str, Any]
+
+    @classmethod
+    def from_api(cls, lecon: dict[str, Any]) -> SaroolLesson:
+        """Construit une leçon à partir d'un dictionnaire de l'API.
+
+        L'API Sarool retourne des dates SANS timezone (heure locale française).
+
+        Raises:
+            ValueError, KeyError: Si la date est absente ou invalide
+        """
+        date_str = lecon["Date"]
+        duree = lecon.get("Duree", 60)  # Durée en minutes
+        start = datetime.fromisoformat(date_str).replace(tzinfo=PARIS_TZ)
+        libelle = (lecon.get("Libelle") or "").strip()
+        numero = lecon.get("Numero", "")
+
+        return cls(
+            key=str(lecon.get("IdRdvEleve") or f"{date_str}|{numero}|{libelle}"),
+            start=start,
+            end=start + timedelta(minutes=duree),
+            duree=duree,
+            libelle=libelle,
+            formateur=lecon.get("Formateur") or "",
+            numero=numero,
+            commentaire=(lecon.get("Commentaire") or "").strip(),
+            previsionnel="prévisionnel" in libelle.lower(),
+            annule=lecon.get("IsAnnule", 0) == 1,
+            raw=lecon,
+        )
+
+    @property
+    def status(self) -> str:
+        """Retourne le statut de la leçon (confirmée, prévisionnelle, annulée)."""
+        if self.annule:
+            return STATUS_CANCELLED
+        if self.previsionnel:
+            return STATUS_PREVISIONNEL
+        return STATUS_CONFIRMED
+
+    def as_dict(self) -> dict[str, Any]:
+        """Retourne une représentation sérialisable de la leçon."""
+        return {
+            "id": self.key,
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "duree": self.duree,
+            "libelle": self.libelle,
+            "moniteur": self.formateur,
+            "numero": self.numero,
+            "commentaire": self.commentaire,
+            "lieu_rdv": self.raw.get("LieuRdv") or "",
+            "status": self.status,
+            "previsionnel": self.previsionnel,
+        }
+
+
+class _LessonIndex:
+    """Liste de leçons triée par début, avec les débuts pour la bissection."""
+
+    __slots__ = ("lessons", "starts", "max_duration")
+
+    def __init__(self, lessons: list[SaroolLesson]) -> None:
+        self.lessons = lessons
+        self.starts = [l.start for l in lessons]
+        self.max_duration = max((l.end - l.start for l in lessons), default=timedelta(0))
+
+    def between(self, start: datetime | None, end: datetime | None) -> list[SaroolLesson]:
+        """Retourne les leçons qui chevauchent la période (bornes optionnelles)."""
+        first = 0
+        if start is not None:
+            first = bisect_left(self.starts, start - self.max_duration)
+        last = len(self.lessons)
+        if end is not None:
+            last = bisect_right(self.starts, end)
+        lessons = self.lessons[first:last]
+        if start is None:
+            return lessons
+        return [l for l in lessons if l.end >= start]
+
+
+class SaroolTimeline:
+    """Leçons triées par date de début, pour des recherches par bissection.
+
+    Les leçons confirmées (F2/Lecons) et prévisionnelles (F2 -> Prestations)
+    sont fusionnées et triées une seule fois par rafraîchissement, au lieu
+    d'être reparsées et retriées à chaque lecture d'une propriété d'entité.
+    """
+
+    def __init__(self, lessons: list[SaroolLesson]) -> None:
+        """Initialise la chronologie et ses index.
+
+        Args:
+            lessons: Leçons parsées (dans n'importe quel ordre)
+        """
+        # Toutes les leçons, annulées comprises
+        self.lessons: list[SaroolLesson] = sorted(lessons, key=lambda l: l.start)
+        # Leçons non annulées, seules affichées dans le calendrier et les capteurs
+        self.active: list[SaroolLesson] = [l for l in self.lessons if not l.annule]
+        self._all = _LessonIndex(self.lessons)
+        self._active = _LessonIndex(self.active)
+        # Accès par identifiant, utilisé pour calculer les différences entre
+        # deux rafraîchissements
+        self.by_key: dict[str, SaroolLesson] = {l.key: l for l in self.lessons}
+
+        # Index par moniteur (insensible à la casse), chacun trié par début
+        by_instructor: dict[str, list[SaroolLesson]] = {}
+        for lesson in self.lessons:
+            by_instructor.setdefault(lesson.formateur.casefold(), []).append(lesson)
+        self._by_instructor = {
+            name: _LessonIndex(lessons) for name, lessons in by_instructor.items()
+        }
+        # Index par statut (confirmée, prévisionnelle, annulée)
+        self._by_status = {
+            status: _LessonIndex([l for l in self.lessons if l.status == status])
+            for status in STATUSES
+        }
+
+    def __len__(self) -> int:
+        """Retourne le nombre total de leçons."""
+        return len(self.lessons)
+
+    def upcoming(self, now: datetime) -> list[SaroolLesson]:
+        """Retourne les leçons non annulées qui commencent après ``now``."""
+        return self.active[bisect_right(self._active.starts, now):]
+
+    def next_lessons(self, now: datetime, count: int) -> list[SaroolLesson]:
+        """Retourne les ``count`` prochaines leçons non annulées.
+
+        La chronologie étant déjà triée, seule la position de ``now`` est
+        recherchée (bissection) : O(log n + count), sans copier ni trier
+        toutes les leçons à venir.
+        """
+        index = bisect_right(self._active.starts, now)
+        return self.active[index:index + count]
+
+    def next_lesson(self, now: datetime) -> SaroolLesson | None:
+        """Retourne la prochaine leçon non annulée, ou None."""
+        index = bisect_right(self._active.starts, now)
+        if index < len(self.active):
+            return self.active[index]
+        return None
+
+    def between(self, start: datetime, end: datetime) -> list[SaroolLesson]:
+        """Retourne les leçons non annulées qui chevauchent la période.
+
+        Args:
+            start: Début de la période
+            end: Fin de la période
+        """
+        return self._active.between(start, end)
+
+    def query(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        instructor: str | None = None,
+        statuses: set[str] | None = None,
+    ) -> list[SaroolLesson]:
+        """Recherche des leçons à l'aide des index.
+
+        La période est résolue par bissection et le moniteur par l'index
+        dédié, de sorte que seules les leçons candidates sont parcourues.
+
+        Args:
+            start: Début de la période (optionnel)
+            end: Fin de la période (optionnel)
+            instructor: Nom du moniteur, insensible à la casse (optionnel)
+            statuses: Statuts acceptés (optionnel, tous par défaut)
+
+        Returns:
+            Leçons correspondantes, triées par date de début
+        """
+        if instructor is not None:
+            index = self._by_instructor.get(instructor.strip().casefold())
+            if index is None:
+                return []
+        elif statuses is not None and len(statuses) == 1:
+            index = self._by_status[next(iter(statuses))]
+        elif statuses is not None and STATUS_CANCELLED not in statuses:
+            index = self._active
+        else:
+            index = self._all
+
+        lessons = index.between(start, end)
+        if statuses is not None:
+            lessons = [l for l in lessons if l.status in statuses]
+        return lessons
+
+
+@dataclass(slots=True)
+class LessonDelta:
+    """Différences de leçons entre deux rafraîchissements.
+
+    Les leçons ``evicted`` n'ont pas disparu de l'API : elles ont dépassé
+    l'horizon de conservation en mémoire et ont été déplacées dans l'archive.
+    """
+
+    added: list[SaroolLesson] = field(default_factory=list)
+    changed: list[tuple[SaroolLesson, SaroolLesson]] = field(default_factory=list)
+    removed: list[SaroolLesson] = field(default_factory=list)
+    evicted: list[SaroolLesson] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        """Indique si au moins une leçon a changé (l'archivage n'en est pas un)."""
+        return bool(self.added or self.changed or self.removed)
+
+
+def diff_timelines(old: SaroolTimeline, new: SaroolTimeline) -> LessonDelta:
+    """Calcule les leçons ajoutées, modifiées et supprimées.
+
+    Args:
+        old: Chronologie du rafraîchissement précédent
+        new: Nouvelle chronologie
+
+    Returns:
+        Différences, les leçons modifiées étant données en paires (ancienne, nouvelle)
+    """
+    delta = LessonDelta()
+    old_by_key = old.by_key
+    for key, lesson in new.by_key.items():
+        previous = old_by_key.get(key)
+        if previous is None:
+            delta.added.append(lesson)
+        elif previous != lesson:
+            delta.changed.append((previous, lesson))
+    new_by_key = new.by_key
+    delta.removed = [l for key, l in old_by_key.items() if key not in new_by_key]
+    return delta
+
+
+def split_timeline(
+    timeline: SaroolTimeline, cutoff: datetime
+) -> tuple[SaroolTimeline, list[SaroolLesson]]:
+    """Sépare les leçons terminées avant ``cutoff`` des leçons récentes.
+
+    Fonction pure, exécutable dans l'exécuteur comme ``build_timeline``.
+
+    Args:
+        timeline: Chronologie complète
+        cutoff: Fin de leçon en deçà de laquelle une leçon est archivée
+
+    Returns:
+        Chronologie des leçons récentes et liste des leçons à archiver
+    """
+    old = [l for l in timeline.lessons if l.end < cutoff]
+    if not old:
+        return timeline, []
+    return SaroolTimeline([l for l in timeline.lessons if l.end >= cutoff]), old
+
+
+def build_timeline(data: dict[str, Any] | None) -> SaroolTimeline:
+    """Construit la chronologie à partir des données du coordinateur.
+
+    Fonction pure, sans accès à la boucle d'événements : elle peut être
+    exécutée dans l'exécuteur pour les historiques volumineux.
+
+    Args:
+        data: Données retournées par ``SaroolApiClient.get_all_data``
+    """
+    if not data:
+        return SaroolTimeline([])
+
+    lessons_data = data.get("lessons") or {}
+    recap_data = data.get("recap") or {}
+    lecons = (lessons_data.get("Lecons") or []) + (recap_data.get("Prestations") or [])
+
+    parsed = []
+    for lecon in lecons:
+        try:
+            parsed.append(SaroolLesson.from_api(lecon))
+        except (ValueError, KeyError, TypeError) as e:
+            _LOGGER.debug(f"Erreur parsing leçon: {e}")
+            continue
+
+    return SaroolTimeline(parsed)
+
+
+def count_lessons(data: dict[str, Any] | None) -> int:
+    """Retourne le nombre brut de leçons (confirmées + prévisionnelles)."""
+    if not data:
+        return 0
+    lessons_data = data.get("lessons") or {}
+    recap_data = data.get("recap") or {}
+    return len(lessons_data.get("Lecons") or []) + len(
+        recap_data.get("Prestations") or []
+    )
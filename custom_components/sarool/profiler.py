@@ -0,0 +1,153 @@
+"""Profilage (cProfile et tracemalloc) limité au code de l'intégration Sarool."""
+from __future__ import annotations
+
+from collections.abc import Callable
+import cProfile
+from datetime import datetime
+import functools
+import io
+import logging
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from typing import Any, TypeVar
+
+_LOGGER = logging.getLogger(__name__)
+
+# Fichiers de l'intégration (filtre des fonctions et des allocations)
+_INTEGRATION_DIR = os.path.dirname(__file__)
+TOP_FUNCTIONS = 25
+TOP_ALLOCATIONS = 25
+
+_T = TypeVar("_T")
+
+
+class ExecutorTimings:
+    """Durées des travaux de l'intégration déportés dans l'exécuteur.
+
+    cProfile ne couvre que le thread de la boucle d'événements (et un seul
+    profileur peut être actif à la fois) : les travaux déportés (décodage des
+    gros JSON, construction de la chronologie, archivage) sont donc
+    chronométrés séparément, par fonction.
+    """
+
+    def __init__(self) -> None:
+        """Initialise des mesures vides."""
+        self._lock = threading.Lock()
+        # Fonction -> [appels, durée totale, durée maximale] (secondes)
+        self.stats: dict[str, list[float]] = {}
+
+    def record(self, name: str, elapsed: float) -> None:
+        """Ajoute la durée d'un travail (appelé depuis les threads de l'exécuteur)."""
+        with self._lock:
+            stats = self.stats.setdefault(name, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = max(stats[2], elapsed)
+
+
+# Mesures du profilage en cours (service sarool.profile), sinon None
+_executor_timings: ExecutorTimings | None = None
+
+
+def start_executor_timings() -> ExecutorTimings:
+    """Commence à chronométrer les travaux déportés dans l'exécuteur."""
+    global _executor_timings  # pylint: disable=global-statement
+    _executor_timings = ExecutorTimings()
+    return _executor_timings
+
+
+def stop_executor_timings() -> None:
+    """Arrête de chronométrer les travaux déportés dans l'exécuteur."""
+    global _executor_timings  # pylint: disable=global-statement
+    _executor_timings = None
+
+
+def profiled(target: Callable[..., _T]) -> Callable[..., _T]:
+    """Retourne ``target``, chronométré si un profilage est en cours.
+
+    À appliquer aux fonctions passées à l'exécuteur ; sans profilage, la
+    fonction est retournée telle quelle.
+    """
+    timings = _executor_timings
+    if timings is None:
+        return target
+    name = f"{getattr(target, '__module__', None) or ''}.{target.__qualname__}".lstrip(".")
+
+    @functools.wraps(target)
+    def _timed(*args: Any, **kwargs: Any) -> _T:
+        start = time.perf_counter()
+        try:
+            return target(*args, **kwargs)
+        finally:
+            timings.record(name, time.perf_counter() - start)
+
+    return _timed
+
+
+def write_profile_report(
+    directory: str,
+    profile: cProfile.Profile,
+    snapshot: tracemalloc.Snapshot | None,
+    duration: float,
+    executor_timings: ExecutorTimings | None = None,
+) -> tuple[str, str]:
+    """Écrit le profil brut et un résumé texte (exécuteur).
+
+    Le profil ``.prof`` contient tous les appels de la boucle d'événements
+    (lisible avec snakeviz ou pstats) ; le résumé ne garde que les
+    fonctions et les sites d'allocation situés dans l'intégration, et
+    ajoute la durée des travaux déportés dans l'exécuteur.
+
+    Args:
+        directory: Dossier de sortie
+        profile: Profil cProfile arrêté
+        snapshot: Instantané tracemalloc (None si indisponible)
+        duration: Durée du profilage (secondes)
+        executor_timings: Durées des travaux déportés dans l'exécuteur
+
+    Returns:
+        Chemins du profil brut et du résumé
+    """
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, f"sarool-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+    profile_path = f"{base}.prof"
+    summary_path = f"{base}.txt"
+    profile.dump_stats(profile_path)
+
+    summary = io.StringIO()
+    summary.write(f"Profil Sarool sur {duration:.0f} s ({profile_path})\n\n")
+    summary.write(f"== {TOP_FUNCTIONS} fonctions les plus coûteuses (temps cumulé) ==\n")
+    stats = pstats.Stats(profile, stream=summary)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+        re.escape(_INTEGRATION_DIR), TOP_FUNCTIONS
+    )
+
+    summary.write(
+        "\n== Travaux déportés dans l'exécuteur (hors cProfile, durée réelle) ==\n"
+    )
+    if not executor_timings or not executor_timings.stats:
+        summary.write("aucun\n")
+    else:
+        summary.write(f"{'appels':>8} {'total (ms)':>12} {'max (ms)':>10}  fonction\n")
+        for name, (calls, total, longest) in sorted(
+            executor_timings.stats.items(), key=lambda item: item[1][1], reverse=True
+        ):
+            summary.write(f"{calls:>8} {total * 1000:>12.1f} {longest * 1000:>10.1f}  {name}\n")
+
+    summary.write(f"\n== {TOP_ALLOCATIONS} principaux sites d'allocation ==\n")
+    if snapshot is None:
+        summary.write("tracemalloc indisponible\n")
+    else:
+        snapshot = snapshot.filter_traces(
+            [tracemalloc.Filter(True, os.path.join(_INTEGRATION_DIR, "*"))]
+        )
+        for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+            summary.write(f"{stat}\n")
+
+    with open(summary_path, "w", encoding="utf-8") as file:
+        file.write(summary.getvalue())
+    return profile_path, summary_path
@@ -0,0 +1,139 @@
+"""Rappels avant les leçons (événements ``sarool_lesson_reminder``)."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+
+from .lessons import LessonDelta, SaroolLesson, SaroolTimeline
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_LESSON_REMINDER = "sarool_lesson_reminder"
+
+
+def parse_reminder_offsets(value: str) -> list[int]:
+    """Convertit l'option des rappels (« 1440, 60 ») en minutes.
+
+    Raises:
+        ValueError: Si une valeur n'est pas un nombre de minutes positif
+    """
+    offsets = sorted(
+        {int(part) for part in value.replace(";", ",").split(",") if part.strip()},
+        reverse=True,
+    )
+    if any(offset <= 0 for offset in offsets):
+        raise ValueError("Les délais de rappel doivent être positifs")
+    return offsets
+
+
+class SaroolReminderScheduler:
+    """Planifie un rappel à chaque délai avant chaque leçon à venir.
+
+    Les minuteurs sont indexés par leçon : après un rafraîchissement, seules
+    les leçons ajoutées, modifiées ou supprimées sont replanifiées, à partir
+    des différences calculées par le coordinateur.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, offsets: list[int]) -> None:
+        """Initialise le planificateur.
+
+        Args:
+            hass: Instance Home Assistant
+            entry_id: Entrée de configuration (incluse dans les événements)
+            offsets: Délais des rappels avant le début des leçons (minutes)
+        """
+        self.hass = hass
+        self._entry_id = entry_id
+        self._offsets = offsets
+        self._timers: dict[str, list[CALLBACK_TYPE]] = {}
+
+    @property
+    def scheduled_count(self) -> int:
+        """Nombre de rappels en attente."""
+        return sum(len(timers) for timers in self._timers.values())
+
+    @callback
+    def async_apply(self, delta: LessonDelta, now: datetime) -> None:
+        """Replanifie les rappels des leçons modifiées par un rafraîchissement.
+
+        Les leçons archivées sont passées et n'ont plus de rappel en attente.
+
+        Args:
+            delta: Différences du dernier rafraîchissement
+            now: Heure courante
+        """
+        for lesson in delta.removed:
+            self._cancel(lesson.key)
+        for old, new in delta.changed:
+            self._cancel(old.key)
+            self._schedule(new, now)
+        for lesson in delta.added:
+            self._schedule(lesson, now)
+
+    @callback
+    def async_reset(self, offsets: list[int], timeline: SaroolTimeline, now: datetime) -> None:
+        """Change les délais et replanifie toutes les leçons à venir.
+
+        Args:
+            offsets: Nouveaux délais (minutes)
+            timeline: Chronologie des leçons
+            now: Heure courante
+        """
+        self.async_cancel_all()
+        self._offsets = offsets
+        for lesson in timeline.upcoming(now):
+            self._schedule(lesson, now)
+
+    @callback
+    def async_cancel_all(self) -> None:
+        """Annule tous les rappels (déchargement de l'entrée)."""
+        for key in list(self._timers):
+            self._cancel(key)
+
+    def _schedule(self, lesson: SaroolLesson, now: datetime) -> None:
+        """Planifie les rappels futurs d'une leçon non annulée."""
+        if lesson.annule or lesson.start <= now:
+            return
+        timers = []
+        for offset in self._offsets:
+            when = lesson.start - timedelta(minutes=offset)
+            if when <= now:
+                continue
+            timers.append(
+                async_track_point_in_time(
+                    self.hass, self._reminder_callback(lesson, offset), when
+                )
+            )
+        if timers:
+            self._timers[lesson.key] = timers
+
+    def _cancel(self, key: str) -> None:
+        """Annule les rappels en attente d'une leçon."""
+        for unsub in self._timers.pop(key, []):
+            unsub()
+
+    def _reminder_callback(self, lesson: SaroolLesson, offset: int):
+        """Retourne le callback qui déclenche le rappel d'une leçon."""
+
+        @callback
+        def _fire(_now: datetime) -> None:
+            timers = self._timers.get(lesson.key)
+            if timers:
+                # Le minuteur déclenché est le plus proche restant (délais décroissants)
+                timers.pop(0)
+                if not timers:
+                    del self._timers[lesson.key]
+            _LOGGER.debug("Rappel Sarool %d min avant la leçon %s", offset, lesson.key)
+            self.hass.bus.async_fire(
+                EVENT_LESSON_REMINDER,
+                {
+                    "config_entry_id": self._entry_id,
+                    "offset_minutes": offset,
+                    **lesson.as_dict(),
+                },
+            )
+
+        return _fire
@@ -9,10 +9,11 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CURRENCY_EURO
+from homeassistant.const import CURRENCY_EURO, PERCENTAGE, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .const import (
     ATTR_COMMENTAIRE,
@@ -25,9 +26,18 @@ from .const import (
     ATTR_NEPH,
     ATTR_SOLDE_GLOBAL,
     ATTR_SOLDE_REEL,
+    CONF_NEXT_LESSONS_COUNT,
+    DEFAULT_NEXT_LESSONS_COUNT,
     DOMAIN,
+    SECTION_INFO,
+    SECTION_LESSONS,
+    SECTION_RECAP,
+    SECTION_UPCOMING,
+    SECTION_USER_DATA,
 )
+from .analytics import formula_hours
 from .coordinator import SaroolDataCoordinator
+from .lessons import PARIS_TZ, SaroolLesson
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -46,19 +56,37 @@ async def async_setup_entry(
     """
     coordinator: SaroolDataCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    # Créer les 3 capteurs
+    # Créer les capteurs
     sensors = [
         SaroolNextLessonSensor(coordinator, entry),
+        SaroolNextLessonsSensor(coordinator, entry),
         SaroolBalanceSensor(coordinator, entry),
         SaroolNotificationsSensor(coordinator, entry),
     ]
 
+    # Capteurs de progression (désactivables dans les options)
+    if coordinator.progress is not None:
+        sensors.extend(
+            [
+                SaroolDrivingHoursSensor(coordinator, entry),
+                SaroolHoursRemainingSensor(coordinator, entry),
+                SaroolLessonsPerWeekSensor(coordinator, entry),
+                SaroolCancellationRateSensor(coordinator, entry),
+            ]
+        )
+
     async_add_entities(sensors)
 
 
 class SaroolSensorBase(CoordinatorEntity, SensorEntity):
     """Classe de base pour les capteurs Sarool."""
 
+    # Sections des données dont dépend le capteur (None = toutes)
+    _sections: frozenset[str] | None = None
+    # Sections sans lesquelles le capteur est indisponible (options de
+    # récupération ou échec prolongé d'une section)
+    _required_sections: frozenset[str] = frozenset()
+
     def __init__(
         self,
         coordinator: SaroolDataCoordinator,
@@ -72,7 +100,8 @@ class SaroolSensorBase(CoordinatorEntity, SensorEntity):
             entry: Entrée de configuration
             sensor_type: Type de capteur (next_lesson, balance, notifications)
         """
-        super().__init__(coordinator)
+        # Contexte = sections dont dépend le capteur (voir async_update_listeners)
+        super().__init__(coordinator, context=self._sections)
         self._attr_unique_id = f"{entry.entry_id}_{sensor_type}"
         self._attr_device_info = {
             "identifiers": {(DOMAIN, entry.entry_id)},
@@ -81,10 +110,41 @@ class SaroolSensorBase(CoordinatorEntity, SensorEntity):
             "model": "Auto-école",
         }
 
+    @property
+    def available(self) -> bool:
+        """Indique si le capteur est disponible.
+        
+        Returns:
+            False si une section dont il dépend n'est plus récupérée ou a
+            dépassé l'âge maximal
+        """
+        if not all(
+            self.coordinator.section_available(section)
+            for section in self._required_sections
+        ):
+            return False
+        return super().available
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Retourne les attributs du capteur et la fraîcheur des données.
+        
+        Returns:
+            Attributs propres au capteur, plus data_age et stale
+        """
+        return {**self._sensor_attributes(), **self.coordinator.freshness_attributes()}
+
+    def _sensor_attributes(self) -> dict[str, Any]:
+        """Retourne les attributs propres au capteur."""
+        return {}
+
 
 class SaroolNextLessonSensor(SaroolSensorBase):
     """Capteur pour la prochaine leçon de conduite."""
 
+    _sections = frozenset({SECTION_LESSONS, SECTION_RECAP, SECTION_UPCOMING})
+    _required_sections = frozenset({SECTION_LESSONS})
+
     def __init__(self, coordinator: SaroolDataCoordinator, entry: ConfigEntry) -> None:
         """Initialise le capteur de prochaine leçon."""
         super().__init__(coordinator, entry, "next_lesson")
@@ -99,90 +159,22 @@ class SaroolNextLessonSensor(SaroolSensorBase):
         Returns:
             Datetime de la prochaine leçon ou None si aucune leçon
         """
-        if not self.coordinator.data:
+        next_lesson = self.coordinator.timeline.next_lesson(datetime.now(PARIS_TZ))
+        if next_lesson is None:
             return None
+        return next_lesson.start
 
-        lessons_data = self.coordinator.data.get("lessons", {})
-        recap_data = self.coordinator.data.get("recap", {})
-        lecons = lessons_data.get("Lecons", []) + recap_data.get("Prestations", [])
-
-        if not lecons:
-            return None
-
-        # L'API Sarool retourne des dates SANS timezone (format local français)
-        from zoneinfo import ZoneInfo
-        
-        paris_tz = ZoneInfo("Europe/Paris")
-        now = datetime.now(paris_tz)
-        
-        future_lessons = []
-        for lecon in lecons:
-            try:
-                # Ignorer les leçons annulées
-                if lecon.get("IsAnnule", 0) == 1:
-                    continue
-                
-                # Parser la date
-                date_str = lecon["Date"]
-                lesson_date_naive = datetime.fromisoformat(date_str)
-                lesson_date = lesson_date_naive.replace(tzinfo=paris_tz)
-                
-                if lesson_date > now:
-                    future_lessons.append((lecon, lesson_date))
-            except (ValueError, KeyError) as e:
-                _LOGGER.debug(f"Erreur parsing date leçon: {e}")
-                continue
-
-        if not future_lessons:
-            return None
-
-        # Trier et prendre la première
-        future_lessons.sort(key=lambda x: x[1])
-        return future_lessons[0][1]
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def _sensor_attributes(self) -> dict[str, Any]:
         """Retourne les attributs supplémentaires du capteur.
         
         Returns:
             Dictionnaire avec moniteur, lieu, commentaire, etc.
         """
-        if not self.coordinator.data:
-            return {}
-
-        lessons_data = self.coordinator.data.get("lessons", {})
-        recap_data = self.coordinator.data.get("recap", {})
-        lecons = lessons_data.get("Lecons", []) + recap_data.get("Prestations", [])
-
-        if not lecons:
+        lesson = self.coordinator.timeline.next_lesson(datetime.now(PARIS_TZ))
+        if lesson is None:
             return {}
 
-        from zoneinfo import ZoneInfo
-        
-        paris_tz = ZoneInfo("Europe/Paris")
-        now = datetime.now(paris_tz)
-        
-        future_lessons = []
-        for lecon in lecons:
-            try:
-                if lecon.get("IsAnnule", 0) == 1:
-                    continue
-                
-                date_str = lecon["Date"]
-                lesson_date_naive = datetime.fromisoformat(date_str)
-                lesson_date = lesson_date_naive.replace(tzinfo=paris_tz)
-                
-                if lesson_date > now:
-                    future_lessons.append((lecon, lesson_date))
-            except (ValueError, KeyError):
-                continue
-
-        if not future_lessons:
-            return {}
-
-        future_lessons.sort(key=lambda x: x[1])
-        next_lesson = future_lessons[0][0]
-
+        next_lesson = lesson.raw
         return {
             ATTR_MONITEUR: next_lesson.get("Formateur") or "Non défini",
             ATTR_LIEU_RDV: next_lesson.get("LieuRdv") or "Non défini",
@@ -191,13 +183,66 @@ class SaroolNextLessonSensor(SaroolSensorBase):
             "duree": next_lesson.get("Duree", 0),
             "numero": next_lesson.get("Numero", 0),
             "id": next_lesson.get("IdRdvEleve", ""),
-            "previsionnel": "prévisionnel" in (next_lesson.get("Libelle") or "").lower(),
+            "previsionnel": lesson.previsionnel,
+        }
+
+
+class SaroolNextLessonsSensor(SaroolSensorBase):
+    """Capteur des N prochaines leçons (nombre configurable dans les options)."""
+
+    _sections = frozenset({SECTION_LESSONS, SECTION_RECAP, SECTION_UPCOMING})
+    _required_sections = frozenset({SECTION_LESSONS})
+
+    def __init__(self, coordinator: SaroolDataCoordinator, entry: ConfigEntry) -> None:
+        """Initialise le capteur des prochaines leçons."""
+        super().__init__(coordinator, entry, "next_lessons")
+        self._attr_name = "Prochaines leçons"
+        self._attr_icon = "mdi:calendar-clock"
+
+    def _next_lessons(self) -> list[SaroolLesson]:
+        """Retourne les prochaines leçons, lues dans la chronologie triée."""
+        count = self.coordinator.options.get(
+            CONF_NEXT_LESSONS_COUNT, DEFAULT_NEXT_LESSONS_COUNT
+        )
+        return self.coordinator.timeline.next_lessons(datetime.now(PARIS_TZ), count)
+
+    @property
+    def native_value(self) -> int:
+        """Retourne le nombre de leçons listées.
+        
+        Returns:
+            Nombre de prochaines leçons (au plus N)
+        """
+        return len(self._next_lessons())
+
+    def _sensor_attributes(self) -> dict[str, Any]:
+        """Retourne la liste des prochaines leçons.
+        
+        Returns:
+            Dictionnaire avec, pour chaque leçon, date, durée, moniteur,
+            lieu et indicateur prévisionnel
+        """
+        return {
+            "lecons": [
+                {
+                    "date": lesson.start.isoformat(),
+                    "duree": lesson.duree,
+                    ATTR_MONITEUR: lesson.formateur or "Non défini",
+                    ATTR_LIEU_RDV: lesson.raw.get("LieuRdv") or "Non défini",
+                    "libelle": lesson.libelle,
+                    "previsionnel": lesson.previsionnel,
+                }
+                for lesson in self._next_lessons()
+            ]
         }
 
 
 class SaroolBalanceSensor(SaroolSensorBase):
     """Capteur pour le solde de l'élève."""
 
+    _sections = frozenset({SECTION_RECAP, SECTION_INFO})
+    _required_sections = frozenset({SECTION_RECAP})
+
     def __init__(self, coordinator: SaroolDataCoordinator, entry: ConfigEntry) -> None:
         """Initialise le capteur de solde."""
         super().__init__(coordinator, entry, "balance")
@@ -220,8 +265,7 @@ class SaroolBalanceSensor(SaroolSensorBase):
         recap = self.coordinator.data.get("recap", {})
         return recap.get("SoldeGlobal")
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def _sensor_attributes(self) -> dict[str, Any]:
         """Retourne les attributs supplémentaires du capteur.
         
         Returns:
@@ -246,6 +290,9 @@ class SaroolBalanceSensor(SaroolSensorBase):
 class SaroolNotificationsSensor(SaroolSensorBase):
     """Capteur pour les notifications (contrats à signer, dossiers incomplets)."""
 
+    _sections = frozenset({SECTION_USER_DATA})
+    _required_sections = frozenset({SECTION_USER_DATA})
+
     def __init__(self, coordinator: SaroolDataCoordinator, entry: ConfigEntry) -> None:
         """Initialise le capteur de notifications."""
         super().__init__(coordinator, entry, "notifications")
@@ -269,8 +316,7 @@ class SaroolNotificationsSensor(SaroolSensorBase):
 
         return nb_contrats + nb_dossier
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def _sensor_attributes(self) -> dict[str, Any]:
         """Retourne les attributs supplémentaires du capteur.
         
         Returns:
@@ -286,4 +332,108 @@ class SaroolNotificationsSensor(SaroolSensorBase):
             ATTR_NB_DOSSIER_INCOMPLET: user_data.get("NbDossierIndispensable", 0) or 0,
             "fiche_eval_signee": user_data.get("IsFicheEvalSigne", False),
             "memo": user_data.get("Memo", ""),
+        }
+
+
+class SaroolDrivingHoursSensor(SaroolSensorBase):
+    """Capteur des heures de conduite effectuées."""
+
+    _sections = frozenset({SECTION_LESSONS, SECTION_RECAP, SECTION_UPCOMING})
+    _required_sections = frozenset({SECTION_LESSONS})
+
+    def __init__(self, coordinator: SaroolDataCoordinator, entry: ConfigEntry) -> None:
+        """Initialise le capteur d'heures de conduite."""
+        super().__init__(coordinator, entry, "driving_hours")
+        self._attr_name = "Heures de conduite"
+        self._attr_icon = "mdi:steering"
+        self._attr_native_unit_of_measurement = UnitOfTime.HOURS
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_state_class = SensorStateClass.TOTAL
+
+    @property
+    def native_value(self) -> float:
+        """Retourne le nombre d'heures de conduite effectuées."""
+        return self.coordinator.progress.driving_hours
+
+    def _sensor_attributes(self) -> dict[str, Any]:
+        """Retourne le nombre de leçons effectuées."""
+        return {"lecons_effectuees": self.coordinator.progress.done_count}
+
+
+class SaroolHoursRemainingSensor(SaroolSensorBase):
+    """Capteur des heures restantes dans la formule de l'élève."""
+
+    _sections = frozenset({SECTION_INFO, SECTION_LESSONS, SECTION_RECAP, SECTION_UPCOMING})
+    _required_sections = frozenset({SECTION_INFO, SECTION_LESSONS})
+
+    def __init__(self, coordinator: SaroolDataCoordinator, entry: ConfigEntry) -> None:
+        """Initialise le capteur d'heures restantes."""
+        super().__init__(coordinator, entry, "hours_remaining")
+        self._attr_name = "Heures restantes"
+        self._attr_icon = "mdi:calendar-check"
+        self._attr_native_unit_of_measurement = UnitOfTime.HOURS
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self) -> float | None:
+        """Retourne les heures de la formule moins les heures effectuées."""
+        info = (self.coordinator.data or {}).get(SECTION_INFO) or {}
+        return self.coordinator.progress.hours_remaining(info)
+
+    def _sensor_attributes(self) -> dict[str, Any]:
+        """Retourne la formule et les leçons déjà réservées."""
+        info = (self.coordinator.data or {}).get(SECTION_INFO) or {}
+        return {
+            ATTR_FORMULE: info.get("Formule", ""),
+            "heures_formule": formula_hours(info.get("Formule")),
+            "lecons_reservees": self.coordinator.progress.upcoming_count,
+        }
+
+
+class SaroolLessonsPerWeekSensor(SaroolSensorBase):
+    """Capteur du nombre moyen de leçons par semaine."""
+
+    _sections = frozenset({SECTION_LESSONS, SECTION_RECAP, SECTION_UPCOMING})
+    _required_sections = frozenset({SECTION_LESSONS})
+
+    def __init__(self, coordinator: SaroolDataCoordinator, entry: ConfigEntry) -> None:
+        """Initialise le capteur de moyenne hebdomadaire."""
+        super().__init__(coordinator, entry, "lessons_per_week")
+        self._attr_name = "Leçons par semaine"
+        self._attr_icon = "mdi:chart-line"
+        self._attr_native_unit_of_measurement = "leçons/semaine"
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self) -> float | None:
+        """Retourne la moyenne de leçons effectuées par semaine."""
+        return self.coordinator.progress.lessons_per_week(dt_util.now())
+
+
+class SaroolCancellationRateSensor(SaroolSensorBase):
+    """Capteur du taux d'annulation des leçons."""
+
+    _sections = frozenset({SECTION_LESSONS, SECTION_RECAP})
+    _required_sections = frozenset({SECTION_LESSONS})
+
+    def __init__(self, coordinator: SaroolDataCoordinator, entry: ConfigEntry) -> None:
+        """Initialise le capteur de taux d'annulation."""
+        super().__init__(coordinator, entry, "cancellation_rate")
+        self._attr_name = "Taux d'annulation"
+        self._attr_icon = "mdi:calendar-remove"
+        self._attr_native_unit_of_measurement = PERCENTAGE
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self) -> float | None:
+        """Retourne le pourcentage de leçons annulées."""
+        return self.coordinator.progress.cancellation_rate
+
+    def _sensor_attributes(self) -> dict[str, Any]:
+        """Retourne le nombre de leçons annulées et le total."""
+        progress = self.coordinator.progress
+        return {
+            "lecons_annulees": progress.cancelled_count,
+            "lecons_total": progress.total_count,
         }
\ No newline at end of file
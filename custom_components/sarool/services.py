@@ -0,0 +1,212 @@
+"""Services de l'intégration Sarool."""
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import logging
+import tracemalloc
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, PROFILE_DIR
+from .coordinator import SaroolDataCoordinator
+from .lessons import STATUSES
+from .profiler import (
+    start_executor_timings,
+    stop_executor_timings,
+    write_profile_report,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_GET_LESSONS = "get_lessons"
+SERVICE_PROFILE = "profile"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_INSTRUCTOR = "instructor"
+ATTR_STATUS = "status"
+ATTR_LIMIT = "limit"
+ATTR_DURATION = "duration"
+ATTR_REFRESH = "refresh"
+
+GET_LESSONS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_INSTRUCTOR): cv.string,
+        vol.Optional(ATTR_STATUS): vol.All(cv.ensure_list, [vol.In(STATUSES)]),
+        vol.Optional(ATTR_LIMIT): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_DURATION, default=60): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=600)
+        ),
+        vol.Optional(ATTR_REFRESH, default=True): cv.boolean,
+    }
+)
+
+
+def _get_coordinator(hass: HomeAssistant, call: ServiceCall) -> SaroolDataCoordinator:
+    """Retourne le coordinateur ciblé par l'appel de service.
+
+    Si aucune entrée n'est précisée et qu'un seul compte est configuré,
+    c'est celui-ci qui est utilisé.
+
+    Raises:
+        ServiceValidationError: Si l'entrée est inconnue ou ambiguë
+    """
+    coordinators: dict[str, SaroolDataCoordinator] = hass.data.get(DOMAIN, {})
+    entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+
+    if entry_id is None:
+        if len(coordinators) != 1:
+            raise ServiceValidationError(
+                "Plusieurs comptes Sarool sont configurés, précisez config_entry_id"
+                if coordinators
+                else "Aucun compte Sarool n'est chargé"
+            )
+        return next(iter(coordinators.values()))
+
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.domain != DOMAIN or entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(f"Entrée Sarool inconnue ou non chargée: {entry_id}")
+    return coordinators[entry_id]
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Enregistre les services de l'intégration.
+
+    Args:
+        hass: Instance Home Assistant
+    """
+
+    async def async_get_lessons(call: ServiceCall) -> ServiceResponse:
+        """Retourne les leçons filtrées et leurs agrégats.
+
+        Les filtres sont résolus par les index de la chronologie du
+        coordinateur (bissection sur les dates, index par moniteur et par
+        statut) au lieu de reparcourir les dictionnaires bruts de l'API,
+        et par les index de l'archive pour les leçons plus anciennes.
+        """
+        coordinator = _get_coordinator(hass, call)
+
+        start = call.data.get(ATTR_START)
+        end = call.data.get(ATTR_END)
+        statuses = call.data.get(ATTR_STATUS)
+
+        lessons = await coordinator.async_query_lessons(
+            start=dt_util.as_local(start) if start else None,
+            end=dt_util.as_local(end) if end else None,
+            instructor=call.data.get(ATTR_INSTRUCTOR),
+            statuses=set(statuses) if statuses else None,
+        )
+
+        # Les agrégats portent sur toutes les leçons trouvées, avant la limite
+        response: dict[str, Any] = {
+            "count": len(lessons),
+            "total_duree": sum(lesson.duree for lesson in lessons),
+        }
+        limit = call.data.get(ATTR_LIMIT)
+        if limit is not None:
+            lessons = lessons[:limit]
+        response["lessons"] = [lesson.as_dict() for lesson in lessons]
+        return response
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_LESSONS,
+        async_get_lessons,
+        schema=GET_LESSONS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    profile_lock = asyncio.Lock()
+
+    async def async_profile(call: ServiceCall) -> ServiceResponse:
+        """Profile l'intégration pendant la durée demandée.
+
+        cProfile couvre la boucle d'événements (rafraîchissements, appels
+        API, évaluation des propriétés des entités) ; les travaux déportés
+        dans l'exécuteur (décodage JSON, chronologie, archive) sont
+        chronométrés par fonction, et tracemalloc suit les allocations de
+        tous les threads. Un rafraîchissement est lancé au début pour que la
+        fenêtre contienne au moins un cycle complet.
+        """
+        if profile_lock.locked():
+            raise ServiceValidationError("Un profilage Sarool est déjà en cours")
+
+        coordinators: list[SaroolDataCoordinator] = []
+        if call.data[ATTR_REFRESH]:
+            if ATTR_CONFIG_ENTRY_ID in call.data:
+                coordinators = [_get_coordinator(hass, call)]
+            else:
+                coordinators = list(hass.data.get(DOMAIN, {}).values())
+
+        async with profile_lock:
+            duration = call.data[ATTR_DURATION]
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError as err:
+                # Un autre profileur (ex: intégration profiler) est actif
+                raise ServiceValidationError(
+                    f"Impossible de démarrer le profilage: {err}"
+                ) from err
+            started_tracemalloc = not tracemalloc.is_tracing()
+            if started_tracemalloc:
+                tracemalloc.start()
+            executor_timings = start_executor_timings()
+            _LOGGER.info("Profilage Sarool démarré pour %.0f s", duration)
+
+            try:
+                for coordinator in coordinators:
+                    await coordinator.async_refresh()
+                await asyncio.sleep(duration)
+            finally:
+                profile.disable()
+                stop_executor_timings()
+                snapshot = tracemalloc.take_snapshot()
+                if started_tracemalloc:
+                    tracemalloc.stop()
+
+            profile_path, summary_path = await hass.async_add_executor_job(
+                write_profile_report,
+                hass.config.path(PROFILE_DIR),
+                profile,
+                snapshot,
+                duration,
+                executor_timings,
+            )
+
+        _LOGGER.info("Profil Sarool écrit dans %s (résumé: %s)", profile_path, summary_path)
+        return {"profile": profile_path, "summary": summary_path}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,235 @@
+"""Traçage du pipeline de rafraîchissement Sarool (spans imbriqués)."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import json
+import logging
+import os
+import secrets
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+# Modes d'export des traces
+TRACE_EXPORT_OFF = "off"
+TRACE_EXPORT_MEMORY = "memory"  # Tampon circulaire affiché dans les diagnostics
+TRACE_EXPORT_FILE = "file"  # Fichier JSONL local avec rotation
+TRACE_EXPORTS = [TRACE_EXPORT_OFF, TRACE_EXPORT_MEMORY, TRACE_EXPORT_FILE]
+
+TRACE_BUFFER_SIZE = 500  # Nombre de spans conservés en mémoire
+TRACE_FILE_MAX_BYTES = 1024 * 1024  # Taille avant rotation du fichier JSONL
+TRACE_FILE_BACKUPS = 3  # Nombre d'anciens fichiers conservés
+
+# Span courant de la tâche asyncio (copié dans les tâches filles de gather)
+_CURRENT_SPAN: ContextVar[SaroolSpan | None] = ContextVar("sarool_span", default=None)
+
+
+class SaroolSpan:
+    """Intervalle de temps nommé appartenant à une trace."""
+
+    __slots__ = (
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "name",
+        "start",
+        "duration_ms",
+        "attributes",
+        "error",
+    )
+
+    def __init__(
+        self, name: str, trace_id: str, parent_id: str | None, attributes: dict[str, Any]
+    ) -> None:
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.time()
+        self.duration_ms = 0.0
+        self.attributes = attributes
+        self.error: str | None = None
+
+    def set(self, **attributes: Any) -> None:
+        """Ajoute des attributs au span."""
+        self.attributes.update(attributes)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Retourne une représentation sérialisable du span."""
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class SaroolTracer:
+    """Collecte les spans et les exporte en mémoire ou dans un fichier JSONL.
+
+    En mode ``off``, ``span`` ne fait rien et ne coûte qu'un test.
+    """
+
+    def __init__(
+        self,
+        export: str = TRACE_EXPORT_OFF,
+        file_path: str | None = None,
+        executor: Callable[..., Awaitable[Any]] | None = None,
+    ) -> None:
+        """Initialise le traceur.
+
+        Args:
+            export: Mode d'export (off, memory, file)
+            file_path: Chemin du fichier JSONL (mode file)
+            executor: Fonction d'exécution hors boucle pour écrire le fichier
+        """
+        self.export = export
+        self.enabled = export != TRACE_EXPORT_OFF
+        self._file_path = file_path
+        self._executor = executor
+        self._buffer: deque[dict[str, Any]] = deque(maxlen=TRACE_BUFFER_SIZE)
+        self._pending: list[dict[str, Any]] = []
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        trace_id: str | None = None,
+        parent_id: str | None = None,
+        **attributes: Any,
+    ) -> Iterator[SaroolSpan | None]:
+        """Mesure un bloc de code dans un span imbriqué.
+
+        Sans ``trace_id`` explicite, le span est rattaché au span courant
+        de la tâche, ou démarre une nouvelle trace.
+
+        Args:
+            name: Nom du span
+            trace_id: Trace à laquelle rattacher le span (optionnel)
+            parent_id: Span parent explicite (optionnel)
+            attributes: Attributs initiaux
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        parent = _CURRENT_SPAN.get()
+        if trace_id is None:
+            if parent is not None:
+                trace_id, parent_id = parent.trace_id, parent.span_id
+            else:
+                trace_id = secrets.token_hex(16)
+
+        span = SaroolSpan(name, trace_id, parent_id, attributes)
+        token = _CURRENT_SPAN.set(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException as err:
+            span.error = repr(err)
+            raise
+        finally:
+            span.duration_ms = round((time.perf_counter() - start) * 1000, 3)
+            _CURRENT_SPAN.reset(token)
+            self._finish(span)
+
+    def record(self, name: str, start: float, end: float, **attributes: Any) -> None:
+        """Enregistre un span déjà terminé, enfant du span courant.
+
+        Utilisé par les callbacks aiohttp, dont le début et la fin sont
+        notifiés séparément.
+
+        Args:
+            name: Nom du span
+            start: Début (``time.perf_counter``)
+            end: Fin (``time.perf_counter``)
+            attributes: Attributs du span
+        """
+        if not self.enabled:
+            return
+        parent = _CURRENT_SPAN.get()
+        if parent is None:
+            span = SaroolSpan(name, secrets.token_hex(16), None, attributes)
+        else:
+            span = SaroolSpan(name, parent.trace_id, parent.span_id, attributes)
+        span.start -= time.perf_counter() - start
+        span.duration_ms = round((end - start) * 1000, 3)
+        self._finish(span)
+
+    def _finish(self, span: SaroolSpan) -> None:
+        """Exporte un span terminé."""
+        data = span.as_dict()
+        if self.export == TRACE_EXPORT_FILE:
+            self._pending.append(data)
+        self._buffer.append(data)
+
+    def recent_traces(self) -> dict[str, list[dict[str, Any]]]:
+        """Retourne les spans en mémoire, regroupés par trace."""
+        traces: dict[str, list[dict[str, Any]]] = {}
+        for span in self._buffer:
+            traces.setdefault(span["trace_id"], []).append(span)
+        return traces
+
+    async def async_flush(self) -> None:
+        """Écrit les spans en attente dans le fichier JSONL (hors boucle)."""
+        if not self._pending or self._file_path is None or self._executor is None:
+            return
+        pending, self._pending = self._pending, []
+        await self._executor(self._write, pending)
+
+    def _write(self, spans: list[dict[str, Any]]) -> None:
+        """Ajoute des spans au fichier JSONL, avec rotation (exécuteur)."""
+        path = self._file_path
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if os.path.exists(path) and os.path.getsize(path) >= TRACE_FILE_MAX_BYTES:
+                for index in range(TRACE_FILE_BACKUPS - 1, 0, -1):
+                    if os.path.exists(f"{path}.{index}"):
+                        os.replace(f"{path}.{index}", f"{path}.{index + 1}")
+                os.replace(path, f"{path}.1")
+            with open(path, "a", encoding="utf-8") as file:
+                for span in spans:
+                    file.write(json.dumps(span, ensure_ascii=False, default=str) + "\n")
+        except OSError as err:
+            _LOGGER.warning("Impossible d'écrire les traces Sarool dans %s: %s", path, err)
+
+    def aiohttp_trace_config(self) -> aiohttp.TraceConfig:
+        """Retourne une configuration aiohttp qui trace DNS et connexion (TLS).
+
+        Les spans sont rattachés au span de la requête en cours.
+        """
+        trace_config = aiohttp.TraceConfig(trace_config_ctx_factory=SimpleNamespace)
+
+        async def on_dns_start(session, ctx, params) -> None:
+            ctx.dns_start = time.perf_counter()
+
+        async def on_dns_end(session, ctx, params) -> None:
+            self.record("http.dns", ctx.dns_start, time.perf_counter(), host=params.host)
+
+        async def on_connect_start(session, ctx, params) -> None:
+            ctx.connect_start = time.perf_counter()
+
+        async def on_connect_end(session, ctx, params) -> None:
+            # Inclut la poignée de main TLS pour les connexions HTTPS
+            self.record("http.connect", ctx.connect_start, time.perf_counter())
+
+        async def on_connection_reused(session, ctx, params) -> None:
+            self.record("http.connection_reused", time.perf_counter(), time.perf_counter())
+
+        trace_config.on_dns_resolvehost_start.append(on_dns_start)
+        trace_config.on_dns_resolvehost_end.append(on_dns_end)
+        trace_config.on_connection_create_start.append(on_connect_start)
+        trace_config.on_connection_create_end.append(on_connect_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reused)
+        return trace_config
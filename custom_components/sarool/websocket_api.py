@@ -0,0 +1,122 @@
+"""Commandes websocket de l'intégration Sarool."""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN, SECTION_LESSONS, SECTION_RECAP, SIGNAL_ENTRY_UNLOADED
+from .coordinator import SaroolDataCoordinator
+from .lessons import LessonDelta
+
+# Sections dont dépend la chronologie des leçons
+_LESSON_SECTIONS = frozenset({SECTION_LESSONS, SECTION_RECAP})
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Enregistre les commandes websocket de l'intégration.
+
+    Args:
+        hass: Instance Home Assistant
+    """
+    websocket_api.async_register_command(hass, websocket_subscribe_lessons)
+
+
+def _delta_message(delta: LessonDelta) -> dict[str, Any]:
+    """Retourne le message envoyé pour les différences d'un rafraîchissement."""
+    return {
+        "added": [lesson.as_dict() for lesson in delta.added],
+        "changed": [new.as_dict() for _old, new in delta.changed],
+        "removed": [lesson.key for lesson in delta.removed],
+    }
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "sarool/lessons/subscribe",
+        vol.Optional("config_entry_id"): str,
+    }
+)
+@callback
+def websocket_subscribe_lessons(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Envoie les leçons une fois, puis seulement leurs différences.
+
+    Le premier événement contient toutes les leçons en mémoire (annulées
+    comprises, avec leur statut). Les suivants, envoyés après chaque
+    rafraîchissement qui modifie les leçons, ne contiennent que les leçons
+    ajoutées, modifiées et les identifiants des leçons supprimées. Les
+    leçons archivées (horizon de conservation) ne sont pas signalées.
+
+    L'abonnement est lié au coordinateur de l'entrée : quand l'entrée est
+    déchargée ou rechargée (options), il se termine par une erreur et le
+    client doit se réabonner.
+    """
+    coordinators: dict[str, SaroolDataCoordinator] = hass.data.get(DOMAIN, {})
+    entry_id = msg.get("config_entry_id")
+    if entry_id is None and len(coordinators) == 1:
+        entry_id = next(iter(coordinators))
+    coordinator = coordinators.get(entry_id) if entry_id is not None else None
+    if coordinator is None or coordinator.entry.state is not ConfigEntryState.LOADED:
+        connection.send_error(
+            msg["id"],
+            websocket_api.const.ERR_NOT_FOUND,
+            "Entrée Sarool inconnue, non chargée ou ambiguë (précisez config_entry_id)",
+        )
+        return
+
+    last_sent = coordinator.last_delta
+
+    @callback
+    def forward_delta() -> None:
+        """Transmet les différences du dernier rafraîchissement."""
+        nonlocal last_sent
+        delta = coordinator.last_delta
+        # Notification sans nouvelles différences (changement de disponibilité)
+        if delta is last_sent or not delta:
+            return
+        last_sent = delta
+        connection.send_message(
+            websocket_api.event_message(msg["id"], _delta_message(delta))
+        )
+
+    unsub_listener = coordinator.async_add_listener(forward_delta, _LESSON_SECTIONS)
+
+    @callback
+    def entry_unloaded() -> None:
+        """Termine l'abonnement quand le coordinateur est arrêté."""
+        connection.subscriptions.pop(msg["id"], None)
+        unsubscribe()
+        connection.send_error(
+            msg["id"],
+            websocket_api.const.ERR_NOT_FOUND,
+            "Entrée Sarool déchargée ou rechargée (réabonnez-vous)",
+        )
+
+    unsub_unloaded = async_dispatcher_connect(
+        hass, SIGNAL_ENTRY_UNLOADED.format(coordinator.entry.entry_id), entry_unloaded
+    )
+
+    @callback
+    def unsubscribe() -> None:
+        """Retire l'écouteur du coordinateur et l'écoute du déchargement."""
+        unsub_listener()
+        unsub_unloaded()
+
+    connection.subscriptions[msg["id"]] = unsubscribe
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(
+            msg["id"],
+            {"lessons": [lesson.as_dict() for lesson in coordinator.timeline.lessons]},
+        )
+    )
@@ -0,0 +1,98 @@
+"""Benchmark du décodage JSON des réponses Sarool.
+
+Compare, sur des payloads réalistes F2/Lecons et Utilisateur/Donnees :
+
+- ``aiohttp``   : chemin historique ``response.json()``, soit décodage des
+                  octets en str puis ``json.loads`` de la bibliothèque standard,
+- ``stdlib``    : ``json.loads`` appliqué directement aux octets,
+- ``ha``        : ``homeassistant.util.json.json_loads`` (orjson), utilisé
+                  par ``SaroolApiClient``,
+- ``orjson``    : ``orjson.loads`` seul, si disponible.
+
+Exemple :
+    python scripts/bench_json.py --lessons 100,1000,5000 --repeat 50
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import timeit
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_sarool_server import build_lessons  # noqa: E402
+
+
+def _decoders() -> dict[str, Callable[[bytes], Any]]:
+    """Retourne les décodeurs disponibles dans l'environnement."""
+    decoders: dict[str, Callable[[bytes], Any]] = {
+        "aiohttp": lambda body: json.loads(body.decode("utf-8")),
+        "stdlib": json.loads,
+    }
+    try:
+        from homeassistant.util.json import json_loads
+
+        decoders["ha"] = json_loads
+    except ImportError:
+        pass
+    try:
+        import orjson
+
+        decoders["orjson"] = orjson.loads
+    except ImportError:
+        pass
+    return decoders
+
+
+def _payloads(lesson_counts: list[int], memo_sizes: list[int]) -> dict[str, bytes]:
+    """Construit les payloads de test, encodés comme les renvoie l'API."""
+    payloads = {}
+    for count in lesson_counts:
+        body = {"Lecons": build_lessons(count, seed=count)}
+        payloads[f"Lecons x{count}"] = json.dumps(body, ensure_ascii=False).encode()
+    for size in memo_sizes:
+        body = {
+            "NbContratsASigner": 1,
+            "NbDossierIndispensable": 2,
+            "IsFicheEvalSigne": False,
+            "Memo": "Rappel : apporter le livret d'apprentissage. " * (size // 45 + 1),
+        }
+        payloads[f"Donnees memo {size}"] = json.dumps(body, ensure_ascii=False).encode()
+    return payloads
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lessons", default="100,1000,5000")
+    parser.add_argument("--memo-sizes", default="200,20000")
+    parser.add_argument("--repeat", type=int, default=50)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    decoders = _decoders()
+    payloads = _payloads(
+        [int(v) for v in args.lessons.split(",")],
+        [int(v) for v in args.memo_sizes.split(",")],
+    )
+
+    print(f"{'payload':<22}{'taille':>10}  " + "".join(f"{n:>12}" for n in decoders))
+    for name, body in payloads.items():
+        timings = []
+        for decoder in decoders.values():
+            best = min(
+                timeit.repeat(lambda: decoder(body), number=1, repeat=args.repeat)
+            )
+            timings.append(best * 1000)
+        print(
+            f"{name:<22}{len(body) / 1024:>8.1f}Ko  "
+            + "".join(f"{t:>10.3f}ms" for t in timings)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark hors ligne d'un rafraîchissement Sarool à partir d'une cassette.
+
+Rejoue une cassette enregistrée (option « Enregistrer les réponses API » de
+l'intégration, dossier ``config/sarool_cassettes/``) à travers le client API,
+puis mesure la construction de la chronologie et les lectures typiques des
+entités (prochaine leçon, fenêtre d'un mois du calendrier, requête indexée).
+
+Exemple :
+    python scripts/bench_replay.py config/sarool_cassettes/<entry_id>/<fichier>.json \\
+        --refreshes 20 --speed 0
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import timedelta
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from custom_components.sarool.api import SaroolApiClient  # noqa: E402
+from custom_components.sarool.cassette import (  # noqa: E402
+    SaroolReplaySession,
+    load_cassette,
+)
+from custom_components.sarool.lessons import (  # noqa: E402
+    SaroolTimeline,
+    build_timeline,
+    diff_timelines,
+)
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+async def _main(args: argparse.Namespace) -> None:
+    cassette = load_cassette(args.cassette)
+    client = SaroolApiClient(SaroolReplaySession(cassette, speed=args.speed))
+    client.set_credentials("pk", "uk")
+    print(
+        f"Cassette v{cassette['version']} du {cassette['recorded_at']} "
+        f"({len(cassette['interactions'])} réponses)"
+    )
+
+    timings: dict[str, list[float]] = {
+        "get_all_data": [],
+        "timeline.build": [],
+        "timeline.diff": [],
+        "next_lesson": [],
+        "calendar month": [],
+        "query instructor": [],
+    }
+    previous = SaroolTimeline([])
+    for _ in range(args.refreshes):
+        start = time.perf_counter()
+        data = await client.get_all_data()
+        timings["get_all_data"].append((time.perf_counter() - start) * 1000)
+
+        timeline, elapsed = _timed(build_timeline, data)
+        timings["timeline.build"].append(elapsed)
+        _, elapsed = _timed(diff_timelines, previous, timeline)
+        timings["timeline.diff"].append(elapsed)
+        previous = timeline
+
+        if not timeline.lessons:
+            continue
+        middle = timeline.lessons[len(timeline.lessons) // 2]
+        _, elapsed = _timed(timeline.next_lesson, middle.start)
+        timings["next_lesson"].append(elapsed)
+        _, elapsed = _timed(
+            timeline.between, middle.start, middle.start + timedelta(days=31)
+        )
+        timings["calendar month"].append(elapsed)
+        _, elapsed = _timed(lambda: timeline.query(instructor=middle.formateur))
+        timings["query instructor"].append(elapsed)
+
+    print(f"{len(previous)} leçons, {args.refreshes} rafraîchissements")
+    for name, values in timings.items():
+        if values:
+            print(
+                f"{name:<18} médiane={statistics.median(values):9.3f} ms "
+                f"max={max(values):9.3f} ms"
+            )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cassette", help="fichier de cassette JSON")
+    parser.add_argument("--refreshes", type=int, default=20)
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="accélération de la latence enregistrée (0 = sans attente)",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(_parse_args()))
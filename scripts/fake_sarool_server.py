@@ -0,0 +1,215 @@
+"""Faux serveur local de l'API Sarool (api.sarool.fr) pour les tests de charge.
+
+Implémente les endpoints utilisés par l'intégration :
+Peripherique, F1, F2, F2/Lecons, F3 et Utilisateur/Donnees.
+
+La latence, le taux d'erreur et la taille des réponses sont configurables,
+ce qui permet de reproduire des comptes avec des historiques de plusieurs
+milliers de leçons.
+
+Utilisation autonome :
+    python scripts/fake_sarool_server.py --port 8765 --lessons 2000 --latency 80
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import random
+
+from aiohttp import web
+
+MONITEURS = ["DUPONT Jean", "MARTIN Claire", "BERNARD Luc", "PETIT Sophie"]
+COMMENTAIRES = ["", "", "", "gare", "lycée", "piscine"]
+
+
+@dataclass
+class FakeServerConfig:
+    """Paramètres du faux serveur."""
+
+    latency_ms: float = 50.0  # Latence moyenne par requête
+    jitter_ms: float = 20.0  # Variation aléatoire de la latence (+/-)
+    error_rate: float = 0.0  # Probabilité de répondre 500
+    lessons: int = 200  # Nombre de leçons renvoyées par F2/Lecons
+    prestations: int = 10  # Nombre de créneaux prévisionnels dans F2
+    memo_size: int = 200  # Taille du mémo dans Utilisateur/Donnees
+    seed: int = 42
+
+
+def build_lessons(count: int, seed: int, previsionnel: bool = False) -> list[dict]:
+    """Génère une liste de leçons au format Sarool, centrée sur aujourd'hui."""
+    rng = random.Random(seed)
+    now = datetime.now().replace(minute=0, second=0, microsecond=0)
+    # Environ 2 leçons par semaine : les 3/4 dans le passé, le reste à venir
+    start = now - timedelta(days=int(count * 3 / 4 * 3.5))
+    lessons = []
+    for numero in range(1, count + 1):
+        date = start + timedelta(days=numero * 3.5, hours=rng.randint(-2, 2))
+        libelle = "Leçon prévisionnelle" if previsionnel else "Leçon de conduite"
+        lessons.append(
+            {
+                "IdRdvEleve": f"{'P' if previsionnel else 'L'}{seed}-{numero}",
+                "Date": date.isoformat(timespec="seconds"),
+                "Duree": rng.choice([60, 60, 90, 120]),
+                "Libelle": libelle,
+                "Formateur": "" if previsionnel else rng.choice(MONITEURS),
+                "Numero": numero,
+                "Commentaire": rng.choice(COMMENTAIRES),
+                "LieuRdv": "Auto-école",
+                "SuiviPedago": "" if rng.random() < 0.7 else "Créneaux, ronds-points",
+                "IsAnnule": 1 if rng.random() < 0.05 else 0,
+            }
+        )
+    return lessons
+
+
+class FakeSaroolServer:
+    """Application aiohttp imitant l'API Sarool."""
+
+    def __init__(self, config: FakeServerConfig | None = None) -> None:
+        """Initialise le faux serveur.
+
+        Args:
+            config: Paramètres de latence, d'erreurs et de taille des réponses
+        """
+        self.config = config or FakeServerConfig()
+        self.request_count = 0
+        self.error_count = 0
+        self._rng = random.Random(self.config.seed)
+        self._runner: web.AppRunner | None = None
+        self._lessons = build_lessons(self.config.lessons, self.config.seed)
+        self._prestations = build_lessons(
+            self.config.prestations, self.config.seed + 1, previsionnel=True
+        )
+
+    def build_app(self) -> web.Application:
+        """Construit l'application aiohttp avec toutes les routes Sarool."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_post("/Peripherique", self._peripherique)
+        app.router.add_get("/F1", self._f1)
+        app.router.add_get("/F2", self._f2)
+        app.router.add_get("/F2/Lecons", self._f2_lecons)
+        app.router.add_get("/F3", self._f3)
+        app.router.add_get("/Utilisateur/Donnees", self._donnees)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Démarre le serveur et retourne son URL de base."""
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        sockets = site._server.sockets  # pylint: disable=protected-access
+        bound_port = sockets[0].getsockname()[1]
+        return f"http://{host}:{bound_port}"
+
+    async def stop(self) -> None:
+        """Arrête le serveur."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        """Applique la latence simulée, les erreurs et le contrôle des clés."""
+        self.request_count += 1
+        cfg = self.config
+        delay = max(0.0, cfg.latency_ms + self._rng.uniform(-cfg.jitter_ms, cfg.jitter_ms))
+        await asyncio.sleep(delay / 1000)
+
+        if cfg.error_rate and self._rng.random() < cfg.error_rate:
+            self.error_count += 1
+            return web.Response(status=500, text="Erreur simulée")
+
+        if request.path != "/Peripherique" and not (
+            request.headers.get("PK") and request.headers.get("UK")
+        ):
+            return web.Response(status=401)
+
+        return await handler(request)
+
+    async def _peripherique(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        if not payload.get("Identifiant") or not payload.get("MotDePasse"):
+            return web.Response(status=404)
+        return web.json_response(
+            {"PK": f"pk-{payload['Identifiant']}", "UK": f"uk-{payload['Identifiant']}"},
+            status=201,
+        )
+
+    async def _f1(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "NEPH": "123456789012",
+                "Nom": "ELEVE",
+                "Prenom": "Test",
+                "Formule": "Permis B - 20h",
+                "MoniteurReferent": MONITEURS[0],
+                "DateInscription": "2024-01-15T00:00:00",
+            }
+        )
+
+    async def _f2(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "SoldeGlobal": -120.5,
+                "SoldeReel": 340.0,
+                "Prestations": self._prestations,
+            }
+        )
+
+    async def _f2_lecons(self, request: web.Request) -> web.Response:
+        return web.json_response({"Lecons": self._lessons})
+
+    async def _f3(self, request: web.Request) -> web.Response:
+        return web.json_response({"Planning": self._lessons[-20:]})
+
+    async def _donnees(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "NbContratsASigner": 1,
+                "NbDossierIndispensable": 0,
+                "IsFicheEvalSigne": True,
+                "Memo": "x" * self.config.memo_size,
+            }
+        )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=50.0, help="latence moyenne (ms)")
+    parser.add_argument("--jitter", type=float, default=20.0, help="variation de latence (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--lessons", type=int, default=200)
+    parser.add_argument("--prestations", type=int, default=10)
+    parser.add_argument("--memo-size", type=int, default=200)
+    return parser.parse_args()
+
+
+async def _serve_forever(args: argparse.Namespace) -> None:
+    server = FakeSaroolServer(
+        FakeServerConfig(
+            latency_ms=args.latency,
+            jitter_ms=args.jitter,
+            error_rate=args.error_rate,
+            lessons=args.lessons,
+            prestations=args.prestations,
+            memo_size=args.memo_size,
+        )
+    )
+    url = await server.start(args.host, args.port)
+    print(f"Faux serveur Sarool démarré sur {url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_serve_forever(_parse_args()))
+    except KeyboardInterrupt:
+        pass
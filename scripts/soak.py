@@ -0,0 +1,364 @@
+"""Banc de charge (soak) de l'intégration Sarool contre le faux serveur local.
+
+Démarre une instance Home Assistant de test (dossier de configuration
+temporaire) et y crée de 1 à 500 entrées de configuration, chacune avec son
+vrai ``SaroolDataCoordinator`` (client API avec déport dans l'exécuteur,
+archive SQLite, suivi de progression, rappels). Chaque coordinateur est
+rafraîchi au rythme de l'intervalle demandé et des écouteurs filtrés par
+contexte imitent les entités. Pour chaque palier sont affichés :
+
+- le retard de la boucle d'événements (p50 / p95 / max),
+- les percentiles de latence d'un rafraîchissement complet (requêtes,
+  chronologie, différences, archivage, progression, rappels et notification
+  des écouteurs),
+- le nombre d'écouteurs notifiés par minute,
+- la mémoire retenue par entrée (coordinateur, chronologie et ses index,
+  cache de décodage), mesurée dans une passe séparée, hors chronométrage,
+  car tracemalloc ralentit chaque allocation,
+- le nombre de requêtes par minute reçues par le serveur.
+
+Nécessite l'environnement de développement Home Assistant (homeassistant,
+aiohttp) pour importer l'intégration.
+
+Exemple :
+    python scripts/soak.py --entries 1,10,100,500 --duration 60 --interval 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import gc
+import inspect
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import MappingProxyType
+
+import aiohttp
+from homeassistant import config_entries
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from custom_components.sarool.api import SaroolApiClient  # noqa: E402
+from custom_components.sarool.archive import SaroolLessonArchive  # noqa: E402
+from custom_components.sarool.const import (  # noqa: E402
+    ARCHIVE_DIR,
+    CONF_ARCHIVE_HORIZON,
+    CONF_PK,
+    CONF_UK,
+    DOMAIN,
+    SECTION_LESSONS,
+    SECTION_RECAP,
+    SECTION_UPCOMING,
+)
+from custom_components.sarool.coordinator import SaroolDataCoordinator  # noqa: E402
+from custom_components.sarool.sensor import SaroolSensorBase  # noqa: E402
+from fake_sarool_server import FakeSaroolServer, FakeServerConfig  # noqa: E402
+
+LAG_PROBE_INTERVAL = 0.05  # Période de la sonde de retard de boucle (secondes)
+
+# Contextes des entités d'une entrée (un écouteur par entité, comme les
+# CoordinatorEntity) : chaque capteur, plus le calendrier
+ENTITY_CONTEXTS = [
+    *(sensor._sections for sensor in SaroolSensorBase.__subclasses__()),
+    frozenset({SECTION_LESSONS, SECTION_RECAP, SECTION_UPCOMING}),
+]
+
+
+@dataclass
+class StageResult:
+    """Mesures collectées pendant un palier."""
+
+    entries: int
+    duration: float
+    refresh_latencies: list[float] = field(default_factory=list)
+    loop_lags: list[float] = field(default_factory=list)
+    failures: int = 0
+    requests: int = 0
+    listener_calls: int = 0
+    memory_per_entry: float = 0.0
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    """Retourne le percentile demandé (0 si aucune valeur)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _create_entry(index: int, pk: str, uk: str, horizon: int) -> ConfigEntry:
+    """Crée une entrée de configuration Sarool simulée."""
+    kwargs = {
+        "version": 1,
+        "minor_version": 1,
+        "domain": DOMAIN,
+        "title": f"Sarool - eleve{index}",
+        "data": {CONF_PK: pk, CONF_UK: uk},
+        "source": config_entries.SOURCE_USER,
+        "options": {CONF_ARCHIVE_HORIZON: horizon},
+        "unique_id": f"eleve{index}",
+    }
+    # Arguments obligatoires des versions récentes de Home Assistant
+    parameters = inspect.signature(ConfigEntry).parameters
+    if "discovery_keys" in parameters:
+        kwargs["discovery_keys"] = MappingProxyType({})
+    if "subentries_data" in parameters:
+        kwargs["subentries_data"] = None
+    return ConfigEntry(**kwargs)
+
+
+async def _async_setup_coordinator(
+    hass: HomeAssistant,
+    session: aiohttp.ClientSession,
+    base_url: str,
+    index: int,
+    horizon: int,
+) -> SaroolDataCoordinator:
+    """Crée le client, l'archive et le coordinateur d'une entrée, comme au chargement."""
+    client = SaroolApiClient(
+        session, base_url=base_url, executor=hass.async_add_executor_job
+    )
+    keys = await client.authenticate(f"eleve{index}", "secret")
+    entry = _create_entry(index, keys["pk"], keys["uk"], horizon)
+
+    archive = None
+    if horizon:
+        archive = SaroolLessonArchive(
+            hass.config.path(ARCHIVE_DIR, f"{entry.entry_id}.db")
+        )
+        await hass.async_add_executor_job(archive.open)
+
+    # Entrée courante, comme pendant async_setup_entry
+    config_entries.current_entry.set(entry)
+    return SaroolDataCoordinator(hass, client, entry, archive)
+
+
+async def _async_shutdown(
+    hass: HomeAssistant, coordinators: list[SaroolDataCoordinator]
+) -> None:
+    """Arrête les coordinateurs et ferme leurs archives, comme au déchargement."""
+    for coordinator in coordinators:
+        await coordinator.async_shutdown()
+        if coordinator.archive is not None:
+            await hass.async_add_executor_job(coordinator.archive.close)
+
+
+def _listener(coordinator: SaroolDataCoordinator, result: StageResult) -> CALLBACK_TYPE:
+    """Retourne un écouteur qui lit ce que lit une entité à sa mise à jour."""
+
+    @callback
+    def _async_update() -> None:
+        result.listener_calls += 1
+        coordinator.timeline.next_lesson(dt_util.now())
+        coordinator.freshness_attributes()
+
+    return _async_update
+
+
+async def _probe_loop_lag(result: StageResult, stop: asyncio.Event) -> None:
+    """Mesure le retard de réveil de la boucle d'événements."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + LAG_PROBE_INTERVAL
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        result.loop_lags.append(max(0.0, loop.time() - expected))
+
+
+async def _run_entry(
+    coordinator: SaroolDataCoordinator,
+    interval: float,
+    result: StageResult,
+    stop: asyncio.Event,
+) -> None:
+    """Boucle de rafraîchissement d'une entrée simulée."""
+    # Répartir les premières requêtes comme le font les entrées réelles
+    await asyncio.sleep(random.uniform(0, interval))
+    while not stop.is_set():
+        start = time.perf_counter()
+        await coordinator.async_refresh()
+        if coordinator.last_update_success:
+            result.refresh_latencies.append(time.perf_counter() - start)
+        else:
+            result.failures += 1
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _run_stage(
+    hass: HomeAssistant,
+    base_url: str,
+    server: FakeSaroolServer,
+    entries: int,
+    duration: float,
+    interval: float,
+    horizon: int,
+) -> StageResult:
+    """Exécute un palier de charge avec ``entries`` entrées simulées."""
+    result = StageResult(entries=entries, duration=duration)
+    stop = asyncio.Event()
+
+    connector = aiohttp.TCPConnector(limit=100)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        coordinators = [
+            await _async_setup_coordinator(hass, session, base_url, index, horizon)
+            for index in range(entries)
+        ]
+        try:
+            unsubs = [
+                coordinator.async_add_listener(_listener(coordinator, result), context)
+                for coordinator in coordinators
+                for context in ENTITY_CONTEXTS
+            ]
+            requests_before = server.request_count
+
+            tasks = [asyncio.create_task(_probe_loop_lag(result, stop))]
+            tasks.extend(
+                asyncio.create_task(_run_entry(coordinator, interval, result, stop))
+                for coordinator in coordinators
+            )
+            await asyncio.sleep(duration)
+            stop.set()
+            await asyncio.gather(*tasks)
+            result.requests = server.request_count - requests_before
+
+            for unsub in unsubs:
+                unsub()
+        finally:
+            await _async_shutdown(hass, coordinators)
+        del coordinators
+
+        result.memory_per_entry = await _measure_memory(
+            hass, session, base_url, entries, horizon
+        )
+    return result
+
+
+async def _measure_memory(
+    hass: HomeAssistant,
+    session: aiohttp.ClientSession,
+    base_url: str,
+    entries: int,
+    horizon: int,
+) -> float:
+    """Mesure la mémoire retenue par entrée, hors de la passe chronométrée.
+
+    De nouveaux coordinateurs effectuent chacun un rafraîchissement complet
+    sous tracemalloc (qui suit aussi les threads de l'exécuteur) ; la mémoire
+    encore allouée ensuite (données, chronologie et index, suivi de
+    progression, cache de décodage) est rapportée au nombre d'entrées.
+
+    Returns:
+        Octets retenus par entrée
+    """
+    gc.collect()
+    tracemalloc.start()
+    coordinators: list[SaroolDataCoordinator] = []
+    try:
+        memory_before = tracemalloc.get_traced_memory()[0]
+        for index in range(entries):
+            coordinators.append(
+                await _async_setup_coordinator(hass, session, base_url, index, horizon)
+            )
+        await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+        gc.collect()
+        memory_after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+        await _async_shutdown(hass, coordinators)
+    return max(0, memory_after - memory_before) / entries
+
+
+def _report(result: StageResult) -> None:
+    """Affiche les mesures d'un palier."""
+    lags_ms = [lag * 1000 for lag in result.loop_lags]
+    lat_ms = [lat * 1000 for lat in result.refresh_latencies]
+    minutes = result.duration / 60
+    print(
+        f"{result.entries:>4} entrées | "
+        f"lag boucle p50={_percentile(lags_ms, 50):6.1f} ms "
+        f"p95={_percentile(lags_ms, 95):6.1f} ms max={max(lags_ms, default=0):6.1f} ms | "
+        f"refresh p50={_percentile(lat_ms, 50):7.1f} ms "
+        f"p95={_percentile(lat_ms, 95):7.1f} ms p99={_percentile(lat_ms, 99):7.1f} ms "
+        f"(n={len(lat_ms)}, échecs={result.failures}) | "
+        f"{result.listener_calls / minutes:8.0f} écouteurs/min | "
+        f"mémoire/entrée={result.memory_per_entry / 1024:8.1f} Kio | "
+        f"{result.requests / minutes:8.0f} req/min"
+    )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--entries",
+        default="1,10,100,500",
+        help="paliers du nombre d'entrées, séparés par des virgules (1 à 500)",
+    )
+    parser.add_argument("--duration", type=float, default=60.0, help="durée d'un palier (s)")
+    parser.add_argument(
+        "--interval", type=float, default=10.0, help="intervalle de rafraîchissement (s)"
+    )
+    parser.add_argument(
+        "--archive-horizon",
+        type=int,
+        default=90,
+        help="horizon d'archivage des leçons (jours, 0 pour tout garder en mémoire)",
+    )
+    parser.add_argument("--latency", type=float, default=50.0, help="latence serveur (ms)")
+    parser.add_argument("--jitter", type=float, default=20.0, help="variation de latence (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--lessons", type=int, default=200)
+    parser.add_argument("--prestations", type=int, default=10)
+    return parser.parse_args()
+
+
+async def _main(args: argparse.Namespace) -> None:
+    stages = [int(value) for value in args.entries.split(",")]
+    for entries in stages:
+        if not 1 <= entries <= 500:
+            raise SystemExit(f"Nombre d'entrées hors limites (1 à 500): {entries}")
+
+    server = FakeSaroolServer(
+        FakeServerConfig(
+            latency_ms=args.latency,
+            jitter_ms=args.jitter,
+            error_rate=args.error_rate,
+            lessons=args.lessons,
+            prestations=args.prestations,
+        )
+    )
+    base_url = await server.start()
+    print(f"Faux serveur Sarool sur {base_url} ({args.lessons} leçons par élève)")
+    with tempfile.TemporaryDirectory(prefix="sarool-soak-") as config_dir:
+        hass = HomeAssistant(config_dir)
+        await hass.async_start()
+        try:
+            for entries in stages:
+                result = await _run_stage(
+                    hass,
+                    base_url,
+                    server,
+                    entries,
+                    args.duration,
+                    args.interval,
+                    args.archive_horizon,
+                )
+                _report(result)
+        finally:
+            await hass.async_stop(force=True)
+            await server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(_parse_args()))
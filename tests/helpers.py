@@ -0,0 +1,35 @@
+"""Fabriques de leçons partagées par les tests."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from custom_components.sarool.lessons import PARIS_TZ, SaroolLesson
+
+# Instant de référence des tests (heure de Paris)
+NOW = datetime(2024, 6, 1, 12, 0, tzinfo=PARIS_TZ)
+
+
+def lecon(
+    key: str,
+    start: datetime,
+    duree: int = 60,
+    formateur: str = "DUPONT Jean",
+    libelle: str = "Leçon de conduite",
+    annule: bool = False,
+) -> dict[str, Any]:
+    """Retourne une leçon au format de l'API Sarool (date locale sans fuseau)."""
+    return {
+        "IdRdvEleve": key,
+        "Date": start.replace(tzinfo=None).isoformat(timespec="seconds"),
+        "Duree": duree,
+        "Libelle": libelle,
+        "Formateur": formateur,
+        "Numero": 1,
+        "IsAnnule": 1 if annule else 0,
+    }
+
+
+def lesson(key: str, days: float, **kwargs: Any) -> SaroolLesson:
+    """Retourne une leçon parsée commençant ``days`` jours après ``NOW``."""
+    return SaroolLesson.from_api(lecon(key, NOW + timedelta(days=days), **kwargs))
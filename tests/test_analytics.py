@@ -0,0 +1,166 @@
+"""Tests du suivi de progression incrémental."""
+from datetime import timedelta
+
+import pytest
+
+from custom_components.sarool.analytics import SaroolProgressTracker, formula_hours
+from custom_components.sarool.lessons import (
+    LessonDelta,
+    SaroolTimeline,
+    diff_timelines,
+    split_timeline,
+)
+
+from .helpers import NOW, lesson
+
+
+def _counters(tracker: SaroolProgressTracker) -> tuple:
+    """Retourne tous les compteurs publics du suivi."""
+    return (
+        tracker.total_count,
+        tracker.cancelled_count,
+        tracker.done_count,
+        tracker.done_minutes,
+        tracker.upcoming_count,
+        tracker.first_done,
+    )
+
+
+def test_apply_counts_each_category() -> None:
+    """Leçons effectuées, prévisionnelles passées, annulées et à venir."""
+    tracker = SaroolProgressTracker()
+    tracker.apply(
+        LessonDelta(
+            added=[
+                lesson("done", -7, duree=90),
+                lesson("slot", -3, libelle="Leçon prévisionnelle"),
+                lesson("cancelled", -1, annule=True),
+                lesson("upcoming", 2),
+            ]
+        ),
+        NOW,
+    )
+
+    assert tracker.total_count == 4
+    assert tracker.done_count == 1
+    assert tracker.driving_hours == 1.5
+    assert tracker.cancelled_count == 1
+    assert tracker.cancellation_rate == 25.0
+    assert tracker.upcoming_count == 1
+    assert tracker.first_done == NOW - timedelta(days=7)
+
+
+def test_advance_moves_started_lessons_to_done() -> None:
+    """Une leçon à venir compte comme effectuée une fois commencée."""
+    tracker = SaroolProgressTracker()
+    tracker.apply(LessonDelta(added=[lesson("a", 1)]), NOW)
+
+    tracker.advance(NOW + timedelta(days=2))
+
+    assert tracker.upcoming_count == 0
+    assert tracker.done_count == 1
+
+
+def test_changed_and_removed_lessons() -> None:
+    """Une leçon modifiée est recomptée, une leçon supprimée est retirée."""
+    tracker = SaroolProgressTracker()
+    booked = lesson("a", 1)
+    other = lesson("b", -2)
+    tracker.apply(LessonDelta(added=[booked, other]), NOW)
+
+    tracker.apply(
+        LessonDelta(changed=[(booked, lesson("a", 1, annule=True))], removed=[other]),
+        NOW,
+    )
+
+    assert _counters(tracker) == (1, 1, 0, 0, 0, None)
+
+
+def test_evicted_lessons_keep_their_contribution() -> None:
+    """Une leçon archivée reste comptée mais n'est plus suivie."""
+    tracker = SaroolProgressTracker()
+    old = lesson("old", -120)
+    tracker.apply(LessonDelta(added=[old, lesson("recent", -1)]), NOW)
+    before = _counters(tracker)
+
+    tracker.apply(LessonDelta(evicted=[old]), NOW)
+    assert _counters(tracker) == before
+
+    # Oubliée : une suppression ultérieure ne la décompte pas une seconde fois
+    tracker.apply(LessonDelta(removed=[old]), NOW)
+    assert _counters(tracker) == before
+
+
+def test_lesson_added_and_evicted_in_same_delta() -> None:
+    """Premier rafraîchissement : les leçons archivées sont comptées puis oubliées."""
+    tracker = SaroolProgressTracker()
+    old = lesson("old", -120)
+
+    tracker.apply(LessonDelta(added=[old, lesson("recent", -1)], evicted=[old]), NOW)
+
+    assert tracker.done_count == 2
+    tracker.apply(LessonDelta(removed=[old]), NOW)
+    assert tracker.done_count == 2
+
+
+@pytest.mark.parametrize("horizon_days", [0.5, 7, 30])
+def test_counters_consistent_across_moving_horizon(horizon_days: float) -> None:
+    """Le suivi alimenté par des deltas élagués égale un suivi sans archive.
+
+    Reproduit l'enchaînement du coordinateur : différence avec la
+    chronologie élaguée précédente, filtrage des leçons déjà archivées,
+    séparation à la nouvelle limite et oubli des leçons archivées connues.
+    """
+    history = [
+        lesson(f"l{index}", index * 2 - 40, annule=index % 7 == 0) for index in range(40)
+    ]
+    horizon = timedelta(days=horizon_days)
+    tracker = SaroolProgressTracker()
+    recent = SaroolTimeline([])
+    previous_cutoff = None
+
+    for step in range(25):
+        now = NOW + timedelta(days=step * 1.5)
+        # L'API renvoie tout l'historique ; une leçon disparaît en cours de route
+        lessons = [l for l in history if not (step >= 10 and l.key == "l30")]
+        full = SaroolTimeline(lessons)
+
+        delta = diff_timelines(recent, full)
+        if previous_cutoff is not None:
+            delta.added = [l for l in delta.added if l.end >= previous_cutoff]
+        cutoff = now - horizon
+        kept, old = split_timeline(full, cutoff)
+        added = {l.key for l in delta.added}
+        delta.evicted = [l for l in old if l.key in recent.by_key or l.key in added]
+        tracker.apply(delta, now)
+        recent, previous_cutoff = kept, cutoff
+
+        reference = SaroolProgressTracker()
+        reference.apply(LessonDelta(added=lessons), now)
+        assert _counters(tracker) == _counters(reference), f"étape {step}"
+
+
+@pytest.mark.parametrize(
+    ("formule", "hours"),
+    [
+        ("Permis B - 20h", 20.0),
+        ("AAC 20 h", 20.0),
+        ("Forfait 30 heures", 30.0),
+        ("Heures 1,5h", 1.5),
+        ("Permis B", None),
+        (None, None),
+    ],
+)
+def test_formula_hours(formule: str | None, hours: float | None) -> None:
+    """Le volume d'heures est lu dans le libellé de la formule."""
+    assert formula_hours(formule) == hours
+
+
+def test_hours_remaining() -> None:
+    """Heures de la formule moins les heures effectuées, sans descendre sous 0."""
+    tracker = SaroolProgressTracker()
+    tracker.apply(LessonDelta(added=[lesson("a", -2, duree=120), lesson("b", 3)]), NOW)
+
+    assert tracker.hours_remaining({"Formule": "Permis B - 20h"}) == 18.0
+    assert tracker.hours_remaining({"Formule": "Code seul"}) is None
+    assert tracker.hours_remaining({"Formule": "Rattrapage 1h"}) == 0
@@ -0,0 +1,86 @@
+"""Tests de l'archive SQLite des leçons."""
+from collections.abc import Iterator
+from datetime import timedelta
+
+import pytest
+
+from custom_components.sarool.archive import SaroolLessonArchive
+from custom_components.sarool.lessons import STATUS_CANCELLED, STATUS_CONFIRMED
+
+from .helpers import NOW, lesson
+
+
+@pytest.fixture
+def archive(tmp_path) -> Iterator[SaroolLessonArchive]:
+    """Archive ouverte contenant quatre leçons passées."""
+    archive = SaroolLessonArchive(str(tmp_path / "archive" / "entry.db"))
+    archive.open()
+    archive.store(
+        [
+            lesson("a", -100, formateur="DUPONT Jean"),
+            lesson("b", -95, formateur="MARTIN Claire"),
+            lesson("c", -92, formateur="Dupont Jean", annule=True),
+            lesson("d", -120, formateur="MARTIN Claire", duree=120),
+        ]
+    )
+    yield archive
+    archive.close()
+
+
+def _keys(lessons) -> list[str]:
+    return [l.key for l in lessons]
+
+
+def test_query_all_sorted_by_start(archive: SaroolLessonArchive) -> None:
+    """Sans filtre, toutes les leçons sont renvoyées par date de début."""
+    assert _keys(archive.query()) == ["d", "a", "b", "c"]
+    assert archive.count() == 4
+
+
+def test_query_period_overlap(archive: SaroolLessonArchive) -> None:
+    """La période sélectionne les leçons qui la chevauchent."""
+    start = NOW - timedelta(days=100, minutes=30)
+
+    assert _keys(archive.query(start, NOW - timedelta(days=94))) == ["a", "b"]
+    # Leçon commencée avant la période mais terminée pendant
+    during = NOW - timedelta(days=100) + timedelta(minutes=30)
+    assert _keys(archive.query(during, during + timedelta(minutes=10))) == ["a"]
+    assert _keys(archive.query(end=NOW - timedelta(days=110))) == ["d"]
+
+
+def test_query_instructor_case_insensitive(archive: SaroolLessonArchive) -> None:
+    """Le moniteur est comparé sans tenir compte de la casse ni des espaces."""
+    assert _keys(archive.query(instructor="  dupont jean ")) == ["a", "c"]
+    assert archive.query(instructor="Inconnu") == []
+
+
+def test_query_statuses(archive: SaroolLessonArchive) -> None:
+    """Les statuts filtrent les leçons annulées ou confirmées."""
+    assert _keys(archive.query(statuses={STATUS_CANCELLED})) == ["c"]
+    assert _keys(
+        archive.query(instructor="Dupont Jean", statuses={STATUS_CONFIRMED})
+    ) == ["a"]
+
+
+def test_query_returns_parsed_lessons(archive: SaroolLessonArchive) -> None:
+    """Les leçons relues sont identiques aux leçons archivées."""
+    assert archive.query(instructor="MARTIN Claire")[0] == lesson(
+        "d", -120, formateur="MARTIN Claire", duree=120
+    )
+
+
+def test_store_replaces_existing_lessons(archive: SaroolLessonArchive) -> None:
+    """Une leçon réarchivée remplace la précédente."""
+    archive.store([lesson("a", -100, formateur="DUPONT Jean", annule=True)])
+
+    assert archive.count() == 4
+    assert _keys(archive.query(statuses={STATUS_CANCELLED})) == ["a", "c"]
+
+
+def test_closed_archive_is_empty(tmp_path) -> None:
+    """Une archive fermée ne renvoie rien et n'écrit rien."""
+    archive = SaroolLessonArchive(str(tmp_path / "entry.db"))
+    archive.store([lesson("a", -100)])
+
+    assert archive.query() == []
+    assert archive.count() == 0
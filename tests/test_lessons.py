@@ -0,0 +1,108 @@
+"""Tests de la chronologie des leçons (différences et séparation)."""
+from dataclasses import replace
+from datetime import timedelta
+
+from custom_components.sarool.lessons import (
+    SaroolTimeline,
+    build_timeline,
+    diff_timelines,
+    split_timeline,
+)
+
+from .helpers import NOW, lecon, lesson
+
+
+def test_diff_timelines_added_changed_removed() -> None:
+    """Chaque leçon est classée selon sa clé et son contenu."""
+    kept = lesson("kept", -3)
+    moved = lesson("moved", 2)
+    gone = lesson("gone", 5)
+    old = SaroolTimeline([kept, moved, gone])
+
+    moved_later = lesson("moved", 4)
+    new_lesson = lesson("new", 7)
+    new = SaroolTimeline([lesson("kept", -3), moved_later, new_lesson])
+
+    delta = diff_timelines(old, new)
+
+    assert delta.added == [new_lesson]
+    assert delta.changed == [(moved, moved_later)]
+    assert delta.removed == [gone]
+    assert delta.evicted == []
+    assert delta
+
+
+def test_diff_timelines_identical() -> None:
+    """Deux chronologies identiques ne produisent aucune différence."""
+    data = {"lessons": {"Lecons": [lecon("a", NOW), lecon("b", NOW + timedelta(days=1))]}}
+
+    delta = diff_timelines(build_timeline(data), build_timeline(data))
+
+    assert not delta
+    assert (delta.added, delta.changed, delta.removed) == ([], [], [])
+
+
+def test_diff_timelines_cancellation_is_a_change() -> None:
+    """Une leçon annulée garde sa clé et apparaît comme modifiée."""
+    booked = lesson("a", 1)
+    cancelled = lesson("a", 1, annule=True)
+
+    delta = diff_timelines(SaroolTimeline([booked]), SaroolTimeline([cancelled]))
+
+    assert delta.changed == [(booked, cancelled)]
+    assert not delta.added and not delta.removed
+
+
+def test_evictions_alone_are_not_a_change() -> None:
+    """Un delta qui ne contient que des leçons archivées est considéré vide."""
+    delta = diff_timelines(SaroolTimeline([]), SaroolTimeline([]))
+    delta.evicted.append(lesson("a", -200))
+
+    assert not delta
+
+
+def test_split_timeline_uses_lesson_end() -> None:
+    """Une leçon est archivée quand elle se termine avant la limite."""
+    old = lesson("old", -100)
+    # Commence avant la limite mais se termine après : conservée
+    straddling = replace(
+        lesson("straddling", -90), end=NOW - timedelta(days=90) + timedelta(hours=2)
+    )
+    recent = lesson("recent", -10)
+    upcoming = lesson("upcoming", 3)
+    timeline = SaroolTimeline([upcoming, old, recent, straddling])
+
+    kept, archived = split_timeline(timeline, NOW - timedelta(days=90))
+
+    assert archived == [old]
+    assert kept.lessons == [straddling, recent, upcoming]
+    assert set(kept.by_key) == {"straddling", "recent", "upcoming"}
+    assert kept.next_lesson(NOW) == upcoming
+
+
+def test_split_timeline_without_old_lessons_returns_same_timeline() -> None:
+    """Sans leçon à archiver, la chronologie est réutilisée telle quelle."""
+    timeline = SaroolTimeline([lesson("a", -1), lesson("b", 1)])
+
+    kept, archived = split_timeline(timeline, NOW - timedelta(days=90))
+
+    assert kept is timeline
+    assert archived == []
+
+
+def test_build_timeline_merges_prestations() -> None:
+    """Les créneaux prévisionnels du récapitulatif sont fusionnés et triés."""
+    data = {
+        "lessons": {"Lecons": [lecon("a", NOW + timedelta(days=2))]},
+        "recap": {
+            "Prestations": [
+                lecon("p", NOW + timedelta(days=1), libelle="Leçon prévisionnelle"),
+                {"IdRdvEleve": "invalide", "Date": "pas une date"},
+            ]
+        },
+    }
+
+    timeline = build_timeline(data)
+
+    assert [l.key for l in timeline.lessons] == ["p", "a"]
+    assert timeline.lessons[0].previsionnel